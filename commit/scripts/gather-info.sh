@@ -1,47 +1,202 @@
 #!/usr/bin/env bash
 set -euo pipefail
+# Gather git context for the commit skill.
+# Usage: gather-info.sh [--budget] [--max-file-bytes N] [--max-total-bytes N]
+#
+# Default: full git status, diff, staged diff and log.
+# --budget: run the git queries concurrently, print --stat summaries, then
+#   per-file hunks up to a byte budget per file (--max-file-bytes, env
+#   GATHER_MAX_FILE_BYTES, default 20000) and overall (--max-total-bytes, env
+#   GATHER_MAX_TOTAL_BYTES, default 200000). Binary, lockfile and generated
+#   files are summarized by their line counts instead of diffed.
+#   Setting either limit implies --budget.
+
+budget=0
+max_file_bytes="${GATHER_MAX_FILE_BYTES:-20000}"
+max_total_bytes="${GATHER_MAX_TOTAL_BYTES:-200000}"
+while [ $# -gt 0 ]; do
+  case "$1" in
+    --budget) budget=1 ;;
+    --max-file-bytes) max_file_bytes="$2"; budget=1; shift ;;
+    --max-total-bytes) max_total_bytes="$2"; budget=1; shift ;;
+    *) echo "Unknown option: $1" >&2; exit 2 ;;
+  esac
+  shift
+done
 
 cd "$(git rev-parse --show-toplevel)"
 
-echo "=== git status ==="
-git status
+print_log() {
+  local default_branch current_branch log_output
 
-echo "=== git diff ==="
-git diff
+  # Detect default branch
+  default_branch=$(git symbolic-ref refs/remotes/origin/HEAD 2>/dev/null | sed 's@^refs/remotes/origin/@@') || true
+  if [ -z "$default_branch" ]; then
+    if git rev-parse --verify main >/dev/null 2>&1; then
+      default_branch="main"
+    elif git rev-parse --verify master >/dev/null 2>&1; then
+      default_branch="master"
+    fi
+  fi
 
-echo "=== git diff --staged ==="
-git diff --staged
+  current_branch=$(git branch --show-current)
 
-echo "=== git log ==="
+  log_output=""
+  if [ -n "$current_branch" ] && [ -n "$default_branch" ]; then
+    if [ "$current_branch" = "$default_branch" ]; then
+      # On default branch — show unpushed commits
+      if git rev-parse --verify "origin/${default_branch}" >/dev/null 2>&1; then
+        log_output=$(git log --oneline "origin/${default_branch}..${default_branch}")
+      fi
+    else
+      # On feature branch — show branch-specific commits
+      log_output=$(git log --oneline "${default_branch}..HEAD")
+    fi
+  fi
 
-# Detect default branch
-default_branch=$(git symbolic-ref refs/remotes/origin/HEAD 2>/dev/null | sed 's@^refs/remotes/origin/@@') || true
-if [ -z "$default_branch" ]; then
-  if git rev-parse --verify main >/dev/null 2>&1; then
-    default_branch="main"
-  elif git rev-parse --verify master >/dev/null 2>&1; then
-    default_branch="master"
+  if [ -n "$log_output" ]; then
+    echo "$log_output"
+  else
+    # Fallback: show last 5 commits for style context
+    git log --oneline -5
   fi
+}
+
+if [ "$budget" = "0" ]; then
+  echo "=== git status ==="
+  git status
+
+  echo "=== git diff ==="
+  git diff
+
+  echo "=== git diff --staged ==="
+  git diff --staged
+
+  echo "=== git log ==="
+  print_log
+  exit 0
 fi
 
-current_branch=$(git branch --show-current)
+# Prints "binary", "lockfile" or "generated" for files summarized instead of
+# diffed; nothing otherwise.
+classify() {
+  local path="$1" added="$2"
+  if [ "$added" = "-" ]; then
+    echo binary
+    return
+  fi
+  case "${path##*/}" in
+    package-lock.json | npm-shrinkwrap.json | yarn.lock | pnpm-lock.yaml | \
+      bun.lock | poetry.lock | uv.lock | Pipfile.lock | pdm.lock | \
+      Cargo.lock | Gemfile.lock | composer.lock | go.sum | flake.lock | \
+      mix.lock | pubspec.lock | Podfile.lock | packages.lock.json)
+      echo lockfile
+      return
+      ;;
+    *.min.js | *.min.css | *.map | *_pb2.py | *_pb2.pyi | *.pb.go | \
+      *.generated.* | *.g.dart)
+      echo generated
+      return
+      ;;
+  esac
+  case "$(git check-attr linguist-generated -- "$path")" in
+    *": set" | *": true") echo generated ;;
+  esac
+}
+
+used_bytes=0
+truncated=0
+omitted=0
+
+# Usage: print_diffs <title> <numstat -z file> [git diff options...]
+print_diffs() {
+  local title="$1" numstat="$2"
+  shift 2
+  local record added deleted rest path old_path label kind limit size
 
-log_output=""
-if [ -n "$current_branch" ] && [ -n "$default_branch" ]; then
-  if [ "$current_branch" = "$default_branch" ]; then
-    # On default branch — show unpushed commits
-    if git rev-parse --verify "origin/${default_branch}" >/dev/null 2>&1; then
-      log_output=$(git log --oneline "origin/${default_branch}..${default_branch}")
+  echo "=== $title ==="
+  while IFS= read -r -d '' record; do
+    added="${record%%$'\t'*}"
+    rest="${record#*$'\t'}"
+    deleted="${rest%%$'\t'*}"
+    path="${rest#*$'\t'}"
+    old_path=""
+    label="$path"
+    if [ -z "$path" ]; then
+      # Renames and copies: the old and new paths follow as separate records
+      IFS= read -r -d '' old_path
+      IFS= read -r -d '' path
+      label="$old_path => $path"
     fi
-  else
-    # On feature branch — show branch-specific commits
-    log_output=$(git log --oneline "${default_branch}..HEAD")
-  fi
-fi
 
-if [ -n "$log_output" ]; then
-  echo "$log_output"
-else
-  # Fallback: show last 5 commits for style context
-  git log --oneline -5
+    kind="$(classify "$path" "$added")"
+    if [ "$kind" = "binary" ]; then
+      echo "--- $label: binary, diff omitted"
+      continue
+    elif [ -n "$kind" ]; then
+      echo "--- $label (+$added -$deleted): $kind, diff omitted"
+      continue
+    fi
+
+    limit=$((max_total_bytes - used_bytes))
+    if [ "$limit" -gt "$max_file_bytes" ]; then
+      limit="$max_file_bytes"
+    fi
+    if [ "$limit" -le 0 ]; then
+      echo "--- $label (+$added -$deleted): diff omitted, total budget exhausted"
+      omitted=$((omitted + 1))
+      continue
+    fi
+
+    # Stream at most one byte over the limit: git stops on SIGPIPE after that.
+    # Literal pathspecs: a file named "a*.txt" must not also match "ab.txt"
+    git --literal-pathspecs diff "$@" -- ${old_path:+"$old_path"} "$path" |
+      head -c $((limit + 1)) >"$tmp/hunk" || true
+    size=$(wc -c <"$tmp/hunk")
+    if [ "$size" -gt "$limit" ]; then
+      # Cut at the last complete line within the limit
+      head -c "$limit" "$tmp/hunk" | sed '$d'
+      echo "[... $label truncated after $limit bytes (+$added -$deleted lines)]"
+      used_bytes=$((used_bytes + limit))
+      truncated=$((truncated + 1))
+    else
+      cat "$tmp/hunk"
+      used_bytes=$((used_bytes + size))
+    fi
+  done <"$numstat"
+}
+
+tmp="$(mktemp -d)"
+trap 'rm -rf "$tmp"' EXIT
+
+# Read-only queries: don't let concurrent commands contend for index.lock
+export GIT_OPTIONAL_LOCKS=0
+git status >"$tmp/status" &
+git diff --stat >"$tmp/stat" &
+git diff --staged --stat >"$tmp/stat-staged" &
+git diff --numstat -z >"$tmp/numstat" &
+git diff --staged --numstat -z >"$tmp/numstat-staged" &
+print_log >"$tmp/log" &
+wait
+
+echo "=== git status ==="
+cat "$tmp/status"
+
+echo "=== git diff --stat ==="
+cat "$tmp/stat"
+
+echo "=== git diff --staged --stat ==="
+cat "$tmp/stat-staged"
+
+print_diffs "git diff (budgeted)" "$tmp/numstat"
+print_diffs "git diff --staged (budgeted)" "$tmp/numstat-staged" --staged
+
+echo "=== budget ==="
+echo "Diff shown: $used_bytes of $max_total_bytes bytes" \
+  "(per file: $max_file_bytes); $truncated file(s) truncated, $omitted omitted."
+if [ $((truncated + omitted)) -gt 0 ]; then
+  echo "Run git diff [--staged] -- <path> for the full hunks of a file."
 fi
+
+echo "=== git log ==="
+cat "$tmp/log"
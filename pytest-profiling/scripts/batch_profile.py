@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""Profile the N slowest tests in parallel, one pytest process each.
+
+Runs the selection once with `--durations=0` to find the N slowest tests
+(setup + call + teardown), then reruns each of them in its own pytest process
+with the pytest_per_test_profile plugin, running up to --jobs processes at a
+time. Only the test itself (setup, call and teardown) is profiled, not
+interpreter startup or collection. The pytest arguments are forwarded to every
+run. Writes one consolidated report: per-test duration and dominant function,
+and the functions ranked by self time across all profiled tests.
+
+Sessions and per-test hotspot summaries are saved in
+$PYTEST_PROFILE_DIR/batch-<timestamp>/ (default: .pytest-profiles) and can be
+compared with profile_diff.py.
+
+Usage:
+  batch_profile.py [--count N] [--jobs J] [--top N] [-- pytest args...]
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from profile_diff import build_summary, fmt_ms, function_times, load_session
+from pytest_per_test_profile import slugify
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+PROFILE_DIR = Path(os.environ.get("PYTEST_PROFILE_DIR", ".pytest-profiles"))
+DURATION_RE = re.compile(r"^([\d.]+)s (setup|call|teardown)\s+(\S.*)$")
+
+
+def slowest_tests(pytest_args: list[str], count: int) -> list[tuple[str, float]]:
+    """Run the selection once and return the slowest nodeids with durations."""
+    command = [sys.executable, "-m", "pytest", "--durations=0", "-q", *pytest_args]
+    result = subprocess.run(command, capture_output=True, text=True, check=False)
+    if result.returncode not in (0, 1):  # 1: some tests failed
+        print(result.stdout, end="")
+        print(result.stderr, end="", file=sys.stderr)
+        print(
+            f"Error: pytest --durations run failed (exit {result.returncode}).",
+            file=sys.stderr,
+        )
+        sys.exit(result.returncode)
+
+    durations: dict[str, float] = {}
+    for line in result.stdout.splitlines():
+        match = DURATION_RE.match(line.strip())
+        if match:
+            seconds, _, nodeid = match.groups()
+            durations[nodeid] = durations.get(nodeid, 0.0) + float(seconds)
+    ranked = sorted(durations.items(), key=lambda kv: kv[1], reverse=True)
+    return ranked[:count]
+
+
+def profile_test(
+    nodeid: str, pytest_args: list[str], output_dir: Path
+) -> tuple[str, Path, int]:
+    """Run one test under the per-test plugin and save its session."""
+    session_path = output_dir / f"{slugify(nodeid)}.pyisession"
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in (str(SCRIPTS_DIR), env.get("PYTHONPATH")) if p
+    )
+    with tempfile.TemporaryDirectory(dir=output_dir) as tmp:
+        command = [sys.executable, "-m", "pytest", nodeid, *pytest_args]
+        command += ["-q", "-p", "no:cacheprovider", "-p", "pytest_per_test_profile"]
+        command += ["--profile-per-test", "--profile-top=1", f"--profile-dir={tmp}"]
+        command += ["--profile-only", nodeid]
+        result = subprocess.run(
+            command, capture_output=True, text=True, env=env, check=False
+        )
+        # The plugin writes per-test-<timestamp>/<slug>.pyisession
+        written = next(Path(tmp).glob("per-test-*/*.pyisession"), None)
+        if written is not None:
+            os.replace(written, session_path)
+    return nodeid, session_path, result.returncode
+
+
+def build_report(
+    tests: list[tuple[str, float]],
+    sessions: dict[str, dict],
+    failed: list[str],
+    top: int,
+) -> list[str]:
+    lines = [
+        f"## Slowest Tests ({len(tests)} profiled)",
+        "",
+        "| Test | Duration | Profiled | Top function (self) | Summary |",
+        "|---|---|---|---|---|",
+    ]
+    suite: dict[str, dict[str, float]] = {}
+    for nodeid, duration in tests:
+        session = sessions.get(nodeid)
+        if session is None:
+            lines.append(f"| {nodeid} | {duration:.2f}s | — | *profiling failed* | |")
+            continue
+        times = function_times(session)
+        hotspot = "—"
+        if times:
+            name, t = max(times.items(), key=lambda kv: kv[1]["self"])
+            hotspot = f"`{name}` {fmt_ms(t['self'])}"
+        lines.append(
+            f"| {nodeid} | {duration:.2f}s | {session.get('duration', 0):.2f}s "
+            f"| {hotspot} | {slugify(nodeid)}.md |"
+        )
+        for name, t in times.items():
+            entry = suite.setdefault(name, {"self": 0.0, "cumulative": 0.0, "tests": 0})
+            entry["self"] += t["self"]
+            entry["cumulative"] += t["cumulative"]
+            entry["tests"] += 1
+    lines.append("")
+
+    lines.append("## Functions Dominating the Slowest Tests")
+    lines.append("")
+    lines.append("| Function | Self (total) | Cumulative (total) | Tests |")
+    lines.append("|---|---|---|---|")
+    ranked = sorted(suite.items(), key=lambda kv: kv[1]["self"], reverse=True)
+    for name, t in ranked[:top]:
+        lines.append(
+            f"| `{name}` | {fmt_ms(t['self'])} | {fmt_ms(t['cumulative'])} "
+            f"| {t['tests']} |"
+        )
+    lines.append("")
+
+    if failed:
+        lines.append("### Profiling Failures")
+        lines.extend(f"- {nodeid}" for nodeid in failed)
+        lines.append("")
+    return lines
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Profile the N slowest tests in parallel with pyinstrument."
+    )
+    parser.add_argument(
+        "--count", type=int, default=20, help="Slowest tests to profile (default: 20)"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Parallel profiling processes (default: CPU count)",
+    )
+    parser.add_argument(
+        "--top", type=int, default=15, help="Functions in the suite table (default: 15)"
+    )
+    parser.add_argument(
+        "pytest_args", nargs=argparse.REMAINDER, help="Arguments passed to pytest"
+    )
+    args = parser.parse_args()
+    if args.pytest_args[:1] == ["--"]:
+        args.pytest_args = args.pytest_args[1:]
+    return args
+
+
+def main():
+    args = parse_args()
+    tests = slowest_tests(args.pytest_args, args.count)
+    if not tests:
+        print("No test durations found.", file=sys.stderr)
+        sys.exit(1)
+
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    output_dir = PROFILE_DIR / f"batch-{stamp}"
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    sessions: dict[str, dict] = {}
+    failed = []
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        results = pool.map(
+            lambda t: profile_test(t[0], args.pytest_args, output_dir), tests
+        )
+        for nodeid, session_path, _ in results:
+            # A failing test still produces a profile; a missing file does not
+            if session_path.exists():
+                sessions[nodeid] = load_session(str(session_path))
+            else:
+                failed.append(nodeid)
+    wall_time = time.perf_counter() - start
+
+    for nodeid, session in sessions.items():
+        summary = [f"# {nodeid}", ""] + build_summary(session, args.top)
+        (output_dir / f"{slugify(nodeid)}.md").write_text(
+            "\n".join(summary), encoding="utf-8"
+        )
+
+    serial_time = sum(s.get("duration", 0.0) for s in sessions.values())
+    report = build_report(tests, sessions, failed, args.top)
+    report.append(
+        f"*Profiled {len(sessions)} tests in {wall_time:.1f}s with {args.jobs} "
+        f"jobs ({serial_time:.1f}s of profiled test time).*"
+    )
+    (output_dir / "summary.md").write_text("\n".join(report), encoding="utf-8")
+    report.append(f"*Saved to {output_dir}*")
+    print("\n".join(report))
+
+
+if __name__ == "__main__":
+    main()
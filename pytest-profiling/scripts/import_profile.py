@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""Profile pytest collection: import times, conftest.py files and test modules.
+
+Runs `pytest --collect-only` under `python -X importtime`, which logs the self
+and cumulative import time of every module in microseconds, rebuilds the
+import tree from the log's nesting and reports:
+  - collection wall time and the time pytest reports for collection
+  - the most expensive top-level imports (cumulative) and modules (self)
+  - the import tree below the most expensive imports
+  - conftest.py import times and the slowest test modules to collect
+
+Each run is saved as imports-<timestamp>.json in $PYTEST_PROFILE_DIR
+(default: .pytest-profiles) and compared with the previous run with the same
+pytest arguments, or with the run given by --compare.
+
+Usage:
+  import_profile.py [--top N] [--min-ms MS] [--compare FILE | --no-compare]
+                    [-- pytest args...]
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+PROFILE_DIR = Path(os.environ.get("PYTEST_PROFILE_DIR", ".pytest-profiles"))
+IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S.*)$")
+COLLECTED_RE = re.compile(r"(\d+) tests? collected in ([\d.]+)s")
+
+
+def parse_importtime(stderr: str) -> list[dict]:
+    """Build the import tree from `-X importtime` output.
+
+    CPython prints each module after its children, indented two spaces per
+    nesting level, so a module adopts the pending nodes one level deeper.
+    """
+    pending: dict[int, list[dict]] = {}
+    for line in stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        depth = (len(indent) - 1) // 2
+        node = {
+            "name": name.strip(),
+            "self": int(self_us) / 1e6,
+            "cumulative": int(cumulative_us) / 1e6,
+            "children": pending.pop(depth + 1, []),
+        }
+        pending.setdefault(depth, []).append(node)
+    return pending.get(0, [])
+
+
+def flatten(nodes: list[dict]) -> dict[str, dict[str, float]]:
+    modules = {}
+    stack = list(nodes)
+    while stack:
+        node = stack.pop()
+        modules[node["name"]] = {
+            "self": node["self"],
+            "cumulative": node["cumulative"],
+        }
+        stack.extend(node["children"])
+    return modules
+
+
+def run_collection(pytest_args: list[str]) -> dict:
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+        timing_file = f.name
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in (str(SCRIPTS_DIR), env.get("PYTHONPATH")) if p
+    )
+    env["PYTEST_COLLECT_TIMING_FILE"] = timing_file
+    command = [sys.executable, "-X", "importtime", "-m", "pytest"]
+    command += ["--collect-only", "-q", "-p", "pytest_collect_timing", *pytest_args]
+
+    start = time.perf_counter()
+    result = subprocess.run(
+        command, capture_output=True, text=True, env=env, check=False
+    )
+    wall_time = time.perf_counter() - start
+
+    try:
+        with open(timing_file, encoding="utf-8") as f:
+            timings = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        timings = {"conftests": {}, "modules": {}}
+    finally:
+        os.unlink(timing_file)
+
+    if result.returncode not in (0, 5):  # 5: no tests collected
+        print(result.stdout, end="")
+        print(
+            f"Error: pytest collection failed (exit {result.returncode}).",
+            file=sys.stderr,
+        )
+        sys.exit(result.returncode)
+
+    collected = COLLECTED_RE.search(result.stdout)
+    tree = parse_importtime(result.stderr)
+    return {
+        "timestamp": datetime.now().strftime("%Y-%m-%dT%H:%M:%S"),
+        "args": pytest_args,
+        "wall_time": wall_time,
+        "collect_time": float(collected.group(2)) if collected else None,
+        "tests": int(collected.group(1)) if collected else 0,
+        "import_time": sum(node["cumulative"] for node in tree),
+        "roots": {node["name"]: node["cumulative"] for node in tree},
+        "modules": flatten(tree),
+        "conftests": timings["conftests"],
+        "test_modules": timings["modules"],
+        "tree": tree,
+    }
+
+
+def fmt_ms(seconds: float | None, signed: bool = False) -> str:
+    if seconds is None:
+        return "—"
+    return f"{seconds * 1000:+.1f}ms" if signed else f"{seconds * 1000:.1f}ms"
+
+
+def build_tree(nodes: list[dict], min_seconds: float, depth: int = 0) -> list[str]:
+    lines = []
+    for node in sorted(nodes, key=lambda n: n["cumulative"], reverse=True):
+        if node["cumulative"] < min_seconds:
+            break
+        lines.append(
+            f"{'  ' * depth}{node['name']}  {fmt_ms(node['cumulative'])} "
+            f"(self {fmt_ms(node['self'])})"
+        )
+        if depth < 3:
+            lines.extend(build_tree(node["children"], min_seconds, depth + 1))
+    return lines
+
+
+def build_report(run: dict, top: int, min_seconds: float) -> list[str]:
+    lines = ["## Collection Profile", ""]
+    lines.append("| Metric | Value |")
+    lines.append("|---|---|")
+    lines.append(f"| Wall time (process) | {run['wall_time']:.2f}s |")
+    collect_time = run["collect_time"]
+    lines.append(
+        f"| Collection (pytest) | "
+        f"{'—' if collect_time is None else f'{collect_time:.2f}s'} |"
+    )
+    lines.append(f"| Tests collected | {run['tests']} |")
+    lines.append(f"| Import time (-X importtime) | {run['import_time']:.2f}s |")
+    lines.append("")
+
+    roots = sorted(run["roots"].items(), key=lambda kv: kv[1], reverse=True)
+    lines.append("### Most Expensive Imports (cumulative)")
+    lines.append("| Module | Cumulative |")
+    lines.append("|---|---|")
+    for name, cumulative in roots[:top]:
+        lines.append(f"| `{name}` | {fmt_ms(cumulative)} |")
+    lines.append("")
+
+    modules = sorted(run["modules"].items(), key=lambda kv: kv[1]["self"], reverse=True)
+    lines.append("### Most Expensive Modules (self)")
+    lines.append("| Module | Self | Cumulative |")
+    lines.append("|---|---|---|")
+    for name, t in modules[:top]:
+        lines.append(f"| `{name}` | {fmt_ms(t['self'])} | {fmt_ms(t['cumulative'])} |")
+    lines.append("")
+
+    heaviest = sorted(run["tree"], key=lambda n: n["cumulative"], reverse=True)
+    tree = build_tree(heaviest[:5], min_seconds)
+    if tree:
+        lines.append(f"### Import Tree (≥ {fmt_ms(min_seconds)})")
+        lines.append("```")
+        lines.extend(tree)
+        lines.append("```")
+        lines.append("")
+
+    if run["conftests"]:
+        lines.append("### conftest.py Files")
+        lines.append("| File | Import time |")
+        lines.append("|---|---|")
+        for path, seconds in sorted(
+            run["conftests"].items(), key=lambda kv: kv[1], reverse=True
+        ):
+            lines.append(f"| {os.path.relpath(path)} | {fmt_ms(seconds)} |")
+        lines.append("")
+
+    if run["test_modules"]:
+        lines.append("### Slowest Test Modules to Collect")
+        lines.append("| Module | Import + collection |")
+        lines.append("|---|---|")
+        for nodeid, seconds in sorted(
+            run["test_modules"].items(), key=lambda kv: kv[1], reverse=True
+        )[:top]:
+            lines.append(f"| {nodeid} | {fmt_ms(seconds)} |")
+        lines.append("")
+    return lines
+
+
+def build_diff(previous: dict, run: dict, top: int, min_seconds: float) -> list[str]:
+    lines = [f"### Compared with {previous['timestamp']}", ""]
+    lines.append("| Metric | Previous | Current | Delta |")
+    lines.append("|---|---|---|---|")
+    for label, key in (
+        ("Wall time (process)", "wall_time"),
+        ("Collection (pytest)", "collect_time"),
+        ("Import time", "import_time"),
+    ):
+        before, after = previous.get(key), run.get(key)
+        delta = after - before if None not in (before, after) else None
+        lines.append(
+            f"| {label} | {fmt_ms(before)} | {fmt_ms(after)} "
+            f"| {fmt_ms(delta, signed=True)} |"
+        )
+    lines.append("")
+
+    changes = []
+    for section, label in (("roots", "import"), ("conftests", "conftest")):
+        for name in previous[section].keys() | run[section].keys():
+            delta = run[section].get(name, 0.0) - previous[section].get(name, 0.0)
+            if abs(delta) >= min_seconds:
+                if label == "conftest":
+                    name = os.path.relpath(name)
+                changes.append((label, name, delta))
+    if changes:
+        lines.append("| Kind | Name | Delta |")
+        lines.append("|---|---|---|")
+        for label, name, delta in sorted(changes, key=lambda c: -abs(c[2]))[:top]:
+            lines.append(f"| {label} | `{name}` | {fmt_ms(delta, signed=True)} |")
+        lines.append("")
+    return lines
+
+
+def latest_run(exclude: Path, pytest_args: list[str]) -> Path | None:
+    """Newest saved run collected with the same pytest arguments."""
+    runs = sorted(p for p in PROFILE_DIR.glob("imports-*.json") if p != exclude)
+    for path in reversed(runs):
+        try:
+            with open(path, encoding="utf-8") as f:
+                if json.load(f).get("args") == pytest_args:
+                    return path
+        except (OSError, json.JSONDecodeError):
+            continue
+    return None
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Profile pytest collection and imports with -X importtime."
+    )
+    parser.add_argument(
+        "--top", type=int, default=15, help="Rows per table (default: 15)"
+    )
+    parser.add_argument(
+        "--min-ms",
+        type=float,
+        default=10.0,
+        help="Hide imports and changes below this (default: 10)",
+    )
+    compare = parser.add_mutually_exclusive_group()
+    compare.add_argument(
+        "--compare", type=Path, help="Previous imports-*.json to compare against"
+    )
+    compare.add_argument("--no-compare", action="store_true", help="Skip comparison")
+    parser.add_argument(
+        "pytest_args", nargs=argparse.REMAINDER, help="Arguments passed to pytest"
+    )
+    args = parser.parse_args()
+    if args.pytest_args[:1] == ["--"]:
+        args.pytest_args = args.pytest_args[1:]
+    return args
+
+
+def main():
+    args = parse_args()
+    min_seconds = args.min_ms / 1000
+    run = run_collection(args.pytest_args)
+
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    path = PROFILE_DIR / f"imports-{stamp}-{os.getpid()}.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(run, f)
+
+    lines = build_report(run, args.top, min_seconds)
+    previous_path = (
+        None if args.no_compare else args.compare or latest_run(path, args.pytest_args)
+    )
+    if previous_path is not None:
+        with open(previous_path, encoding="utf-8") as f:
+            previous = json.load(f)
+        lines.extend(build_diff(previous, run, args.top, min_seconds))
+    lines.append(f"*Saved to {path}*")
+    print("\n".join(lines))
+
+
+if __name__ == "__main__":
+    main()
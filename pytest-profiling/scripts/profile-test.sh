@@ -1,6 +1,79 @@
 #!/usr/bin/env bash
 set -euo pipefail
 # Wrapper around pyinstrument for pytest profiling.
-# Usage: profile-test.sh <test_dir> [-k "filter"] [extra pytest args...]
-# All arguments are passed through to pytest via pyinstrument.
-uv run pyinstrument -r text -m pytest "$@" -q
+# Usage: profile-test.sh [MODE] <test_dir> [-k "filter"] [extra pytest args...]
+# All other arguments are passed through to pytest.
+#
+# Modes:
+#   (default)   Profile the whole run as one pyinstrument tree.
+#   --per-test  Profile each test separately (pytest_per_test_profile plugin);
+#               tune with --profile-top=N and --profile-functions=N.
+#   --fixtures  Record setup/teardown cost of every fixture instance
+#               (pytest_fixture_cost plugin); tune with --fixture-cost-top=N
+#               and --fixture-cost-min-ms=MS.
+#   --memory    Peak/retained memory per test and fixture, allocation sites
+#               and leak candidates (pytest_memory_profile plugin, tracemalloc);
+#               tune with --memory-top=N and --memory-leak-kb=KB.
+#   --imports   Collection only, under -X importtime (import_profile.py):
+#               import tree, conftest.py costs, diff with the previous run.
+#               Script options go first, pytest args after "--".
+#   --batch     Find the N slowest tests with --durations, then profile each in
+#               its own process, in parallel across cores (batch_profile.py);
+#               tune with --count=N and --jobs=J. Script options go first,
+#               pytest args after "--".
+#
+# Each run is saved as a pyinstrument session in $PYTEST_PROFILE_DIR
+# (default: .pytest-profiles) so runs can be compared with profile_diff.py.
+# Set PYTEST_PROFILE_SPEEDSCOPE=1 to also export speedscope JSON.
+scripts_dir="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+profile_dir="${PYTEST_PROFILE_DIR:-.pytest-profiles}"
+mkdir -p "$profile_dir"
+export PYTEST_PROFILE_DIR="$profile_dir"
+
+run_with_plugin() {
+  PYTHONPATH="$scripts_dir${PYTHONPATH:+:$PYTHONPATH}" uv run pytest -p "$@" -q
+}
+
+case "${1:-}" in
+  --per-test)
+    shift
+    run_with_plugin pytest_per_test_profile --profile-per-test \
+      --profile-dir "$profile_dir" "$@"
+    exit
+    ;;
+  --fixtures)
+    shift
+    run_with_plugin pytest_fixture_cost --fixture-cost "$@"
+    exit
+    ;;
+  --memory)
+    shift
+    run_with_plugin pytest_memory_profile --memory-profile "$@"
+    exit
+    ;;
+  --imports)
+    shift
+    uv run python "$scripts_dir/import_profile.py" "$@"
+    exit
+    ;;
+  --batch)
+    shift
+    uv run python "$scripts_dir/batch_profile.py" "$@"
+    exit
+    ;;
+esac
+
+name="$(date +%Y%m%d-%H%M%S)-$$"
+session="$profile_dir/$name.pyisession"
+
+status=0
+uv run pyinstrument -r session -o "$session" -m pytest "$@" -q || status=$?
+
+if [ -f "$session" ]; then
+  uv run pyinstrument --load "$session" -r text
+  if [ "${PYTEST_PROFILE_SPEEDSCOPE:-0}" = "1" ]; then
+    uv run pyinstrument --load "$session" -r speedscope -o "$profile_dir/$name.speedscope.json"
+  fi
+  echo "Profile saved to $session" >&2
+fi
+exit "$status"
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""Summarize or compare pyinstrument sessions by function time.
+
+Reads .pyisession files saved by profile-test.sh. With one session, prints
+the functions with the most self time. With two, prints the top regressions
+and improvements from BEFORE to AFTER.
+
+Self time is the time a function was on top of the stack; cumulative time
+includes its callees (recursive frames are counted once per sample).
+
+Usage:
+  profile_diff.py SESSION [--top N]
+  profile_diff.py BEFORE AFTER [--top N] [--by self|cumulative] [--min-ms MS]
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+IDENTIFIER_SEP = "\x00"
+ATTRIBUTES_SEP = "\x01"
+
+
+def load_session(path: str) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Error: Failed to read session {path}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def short_path(path: str, sys_path: list[str]) -> str:
+    """Strip the longest sys.path prefix, as pyinstrument does in its output."""
+    prefixes = [p for p in sys_path if p and path.startswith(p.rstrip("/") + "/")]
+    if not prefixes:
+        return path
+    return path[len(max(prefixes, key=len).rstrip("/")) + 1 :]
+
+
+def function_name(frame: str, sys_path: list[str]) -> str:
+    identifier = frame.split(ATTRIBUTES_SEP, 1)[0]
+    parts = identifier.split(IDENTIFIER_SEP)
+    if len(parts) < 3:
+        return identifier
+    func, path, line = parts[:3]
+    return f"{func} ({short_path(path, sys_path)}:{line})"
+
+
+def function_times(session: dict) -> dict[str, dict[str, float]]:
+    """Aggregate self and cumulative seconds per function."""
+    sys_path = session.get("sys_path", [])
+    names: dict[str, str] = {}
+    times: dict[str, dict[str, float]] = {}
+    for stack, duration in session.get("frame_records", []):
+        seen = set()
+        for frame in stack:
+            name = names.get(frame)
+            if name is None:
+                name = names[frame] = function_name(frame, sys_path)
+            if name in seen:
+                continue
+            seen.add(name)
+            entry = times.setdefault(name, {"self": 0.0, "cumulative": 0.0})
+            entry["cumulative"] += duration
+        if stack:
+            times[names[stack[-1]]]["self"] += duration
+    return times
+
+
+def fmt_ms(seconds: float, signed: bool = False) -> str:
+    return f"{seconds * 1000:+.1f}ms" if signed else f"{seconds * 1000:.1f}ms"
+
+
+def build_summary(session: dict, top: int) -> list[str]:
+    times = function_times(session)
+    ranked = sorted(times.items(), key=lambda kv: kv[1]["self"], reverse=True)
+    lines = [
+        "## Profile Hotspots",
+        "",
+        f"Duration: {session.get('duration', 0):.2f}s "
+        f"({session.get('sample_count', 0)} samples)",
+        "",
+        "| Function | Self | Cumulative |",
+        "|---|---|---|",
+    ]
+    for name, t in ranked[:top]:
+        lines.append(f"| `{name}` | {fmt_ms(t['self'])} | {fmt_ms(t['cumulative'])} |")
+    lines.append("")
+    return lines
+
+
+def build_diff(
+    before: dict, after: dict, top: int, by: str, min_ms: float
+) -> list[str]:
+    before_times = function_times(before)
+    after_times = function_times(after)
+    zero = {"self": 0.0, "cumulative": 0.0}
+
+    rows = []
+    for name in before_times.keys() | after_times.keys():
+        b = before_times.get(name, zero)
+        a = after_times.get(name, zero)
+        delta = a[by] - b[by]
+        if abs(delta) * 1000 >= min_ms:
+            rows.append((name, b, a, delta))
+
+    before_duration = before.get("duration", 0)
+    after_duration = after.get("duration", 0)
+    lines = [
+        "## Profile Diff",
+        "",
+        "| | Before | After | Delta |",
+        "|---|---|---|---|",
+        f"| Duration | {before_duration:.2f}s | {after_duration:.2f}s "
+        f"| {after_duration - before_duration:+.2f}s |",
+        "",
+    ]
+
+    regressions = sorted((r for r in rows if r[3] > 0), key=lambda r: -r[3])
+    improvements = sorted((r for r in rows if r[3] < 0), key=lambda r: r[3])
+    for title, selected in (
+        ("Top Regressions", regressions[:top]),
+        ("Top Improvements", improvements[:top]),
+    ):
+        lines.append(f"### {title} (by {by} time)")
+        if not selected:
+            lines.append("*None.*")
+            lines.append("")
+            continue
+        lines.append(
+            "| Function | Self before | Self after | Cum. before | Cum. after | Delta |"
+        )
+        lines.append("|---|---|---|---|---|---|")
+        for name, b, a, delta in selected:
+            lines.append(
+                f"| `{name}` | {fmt_ms(b['self'])} | {fmt_ms(a['self'])} "
+                f"| {fmt_ms(b['cumulative'])} | {fmt_ms(a['cumulative'])} "
+                f"| {fmt_ms(delta, signed=True)} |"
+            )
+        lines.append("")
+    return lines
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Summarize or compare pyinstrument sessions by function time."
+    )
+    parser.add_argument("sessions", nargs="+", metavar="SESSION", type=Path)
+    parser.add_argument(
+        "--top", type=int, default=15, help="Rows per table (default: 15)"
+    )
+    parser.add_argument(
+        "--by",
+        choices=("self", "cumulative"),
+        default="self",
+        help="Time used to rank changes (default: self)",
+    )
+    parser.add_argument(
+        "--min-ms",
+        type=float,
+        default=1.0,
+        help="Ignore changes smaller than this (default: 1.0)",
+    )
+    args = parser.parse_args()
+    if len(args.sessions) > 2:
+        parser.error("expected one session to summarize or two to compare")
+    return args
+
+
+def main():
+    args = parse_args()
+    sessions = [load_session(str(path)) for path in args.sessions]
+    if len(sessions) == 1:
+        lines = build_summary(sessions[0], args.top)
+    else:
+        lines = build_diff(sessions[0], sessions[1], args.top, args.by, args.min_ms)
+    print("\n".join(lines))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""pytest plugin that times conftest.py imports and test module collection.
+
+pytest imports conftest.py files and test modules through importlib, which
+`-X importtime` does not report, so import_profile.py loads this plugin to
+attribute collection time to them. Results are written as JSON to the path in
+$PYTEST_COLLECT_TIMING_FILE.
+
+Conftest timing wraps a private pytest method; if it is missing (other pytest
+versions), only test modules are timed.
+"""
+
+import json
+import os
+import time
+
+import pytest
+from _pytest.config import PytestPluginManager
+
+TIMING_FILE = os.environ.get("PYTEST_COLLECT_TIMING_FILE")
+
+_timings: dict[str, dict[str, float]] = {"conftests": {}, "modules": {}}
+
+
+def _timed_importconftest(original):
+    def wrapper(self, conftestpath, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return original(self, conftestpath, *args, **kwargs)
+        finally:
+            path = str(conftestpath)
+            # pytest caches conftests: only the first (real) import counts
+            _timings["conftests"].setdefault(path, time.perf_counter() - start)
+
+    return wrapper
+
+
+if TIMING_FILE and hasattr(PytestPluginManager, "_importconftest"):
+    # pylint: disable-next=protected-access
+    PytestPluginManager._importconftest = _timed_importconftest(
+        PytestPluginManager._importconftest  # pylint: disable=protected-access
+    )
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_make_collect_report(collector):
+    start = time.perf_counter()
+    yield
+    if isinstance(collector, pytest.Module):
+        _timings["modules"][collector.nodeid] = time.perf_counter() - start
+
+
+def pytest_collection_finish():
+    if TIMING_FILE:
+        with open(TIMING_FILE, "w", encoding="utf-8") as f:
+            json.dump(_timings, f)
@@ -0,0 +1,175 @@
+"""pytest plugin that accounts for the setup and teardown cost of fixtures.
+
+Times every fixture instance across the session and aggregates per fixture:
+scope, number of instances, total setup and teardown time. Function-scoped
+fixtures that are set up repeatedly at significant total cost are flagged,
+with the time a broader scope would save if the fixture holds no per-test
+state.
+
+Setup time excludes the fixtures it depends on (pytest sets those up first);
+teardown time covers the fixture's own finalizers.
+
+Enable with:
+  PYTHONPATH=<scripts dir> pytest -p pytest_fixture_cost --fixture-cost
+"""
+
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+PROFILE_DIR = Path(os.environ.get("PYTEST_PROFILE_DIR", ".pytest-profiles"))
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("fixture-cost", "fixture cost accounting")
+    group.addoption(
+        "--fixture-cost",
+        action="store_true",
+        help="Record setup and teardown time of every fixture instance",
+    )
+    group.addoption(
+        "--fixture-cost-top",
+        type=int,
+        default=20,
+        help="Fixtures listed in the report (default: 20)",
+    )
+    group.addoption(
+        "--fixture-cost-min-ms",
+        type=float,
+        default=100.0,
+        help="Total cost above which a repeated function-scoped fixture is "
+        "flagged (default: 100)",
+    )
+
+
+def pytest_configure(config):
+    if config.getoption("fixture_cost"):
+        config.pluginmanager.register(FixtureCost(config), "fixture-cost")
+
+
+def fixture_key(fixturedef) -> tuple[str, str]:
+    """Identify a fixture definition by name and where it is defined.
+
+    baseid (the conftest directory or test module) comes first: without
+    packages, every conftest.py is imported as a module named "conftest".
+    Root conftest and plugin fixtures have no baseid and use their module.
+    """
+    module = getattr(fixturedef.func, "__module__", None)
+    return fixturedef.argname, fixturedef.baseid or module or "<unknown>"
+
+
+class FixtureCost:
+    def __init__(self, config):
+        self.top = config.getoption("fixture_cost_top")
+        self.min_seconds = config.getoption("fixture_cost_min_ms") / 1000
+        # --profile-dir is defined by pytest_per_test_profile, when loaded
+        self.profile_dir = Path(config.getoption("profile_dir", PROFILE_DIR))
+        self.stats: dict[tuple[str, str], dict] = {}
+        self.teardown_started: dict[int, float] = {}
+
+    def entry(self, fixturedef) -> dict:
+        return self.stats.setdefault(
+            fixture_key(fixturedef),
+            {"scope": fixturedef.scope, "count": 0, "setup": 0.0, "teardown": 0.0},
+        )
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef):
+        start = time.perf_counter()
+        outcome = yield
+        elapsed = time.perf_counter() - start
+        entry = self.entry(fixturedef)
+        entry["count"] += 1
+        entry["setup"] += elapsed
+        if outcome.excinfo is None:
+            # Finalizers run last-in first-out: registered after the fixture's
+            # own teardown, this marker runs right before it.
+            key = id(fixturedef)
+            fixturedef.addfinalizer(lambda: self.mark_teardown(key))
+
+    def mark_teardown(self, key: int) -> None:
+        self.teardown_started[key] = time.perf_counter()
+
+    def pytest_fixture_post_finalizer(self, fixturedef):
+        start = self.teardown_started.pop(id(fixturedef), None)
+        if start is not None:
+            self.entry(fixturedef)["teardown"] += time.perf_counter() - start
+
+    def rows(self) -> list[dict]:
+        rows = []
+        for (name, module), stats in self.stats.items():
+            total = stats["setup"] + stats["teardown"]
+            saving = 0.0
+            repeated = stats["scope"] == "function" and stats["count"] > 1
+            if repeated and total >= self.min_seconds:
+                # Widened to session scope, the fixture would run once
+                saving = total - total / stats["count"]
+            rows.append(
+                {
+                    "fixture": name,
+                    "module": module,
+                    **stats,
+                    "total": total,
+                    "saving": saving,
+                }
+            )
+        return sorted(rows, key=lambda r: r["total"], reverse=True)
+
+    def build_report(self, rows: list[dict]) -> list[str]:
+        lines = [
+            "## Fixture Cost",
+            "",
+            "| Fixture | Defined in | Scope | Instances | Setup | Teardown "
+            "| Total | Avg |",
+            "|---|---|---|---|---|---|---|---|",
+        ]
+        for r in rows[: self.top]:
+            lines.append(
+                f"| `{r['fixture']}` | {r['module']} | {r['scope']} "
+                f"| {r['count']} "
+                f"| {r['setup']:.3f}s | {r['teardown']:.3f}s | {r['total']:.3f}s "
+                f"| {r['total'] / r['count'] * 1000:.1f}ms |"
+            )
+        lines.append("")
+
+        flagged = sorted(
+            (r for r in rows if r["saving"]),
+            key=lambda r: r["saving"],
+            reverse=True,
+        )
+        if flagged:
+            lines.append("### Scope Candidates")
+            lines.append(
+                "Function-scoped fixtures with repeated cost. If they hold no "
+                "per-test state, a broader scope would save up to:"
+            )
+            lines.append("")
+            lines.append("| Fixture | Instances | Total | Potential saving |")
+            lines.append("|---|---|---|---|")
+            for r in flagged:
+                lines.append(
+                    f"| `{r['fixture']}` | {r['count']} | {r['total']:.3f}s "
+                    f"| ~{r['saving']:.3f}s |"
+                )
+            lines.append("")
+        return lines
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.stats:
+            return
+        rows = self.rows()
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = self.profile_dir / f"fixtures-{stamp}.json"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+            f.write("\n")
+
+        terminalreporter.write_sep("=", "fixture cost")
+        for line in self.build_report(rows):
+            terminalreporter.write_line(line)
+        terminalreporter.write_line(f"Fixture costs written to {path}")
@@ -0,0 +1,234 @@
+"""pytest plugin that profiles memory per test and per fixture with tracemalloc.
+
+For each test (setup, call and teardown) it records the peak memory above the
+level the test started at, and the memory still allocated once the test is
+torn down. Memory retained by module-, class-, package- or session-scoped
+fixtures set up during the test is expected to stay alive and is not counted
+against the test; what remains is flagged as a potential leak.
+
+For each fixture it records the memory allocated by its setup and the peak
+during setup. At the end of the session it lists the allocation sites that
+grew the most while tests ran, and the overall growth of traced memory.
+
+Enable with:
+  PYTHONPATH=<scripts dir> pytest -p pytest_memory_profile --memory-profile
+"""
+
+import json
+import os
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from pytest_fixture_cost import fixture_key
+
+PROFILE_DIR = Path(os.environ.get("PYTEST_PROFILE_DIR", ".pytest-profiles"))
+SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("memory-profile", "memory profiling")
+    group.addoption(
+        "--memory-profile",
+        action="store_true",
+        help="Record peak and retained memory per test and fixture",
+    )
+    group.addoption(
+        "--memory-top",
+        type=int,
+        default=20,
+        help="Rows per table (default: 20)",
+    )
+    group.addoption(
+        "--memory-leak-kb",
+        type=float,
+        default=1024.0,
+        help="Retained memory above which a test is flagged (default: 1024)",
+    )
+
+
+def pytest_configure(config):
+    if config.getoption("memory_profile"):
+        config.pluginmanager.register(MemoryProfile(config), "memory-profile")
+
+
+def display_path(path: str) -> str:
+    relative = os.path.relpath(path)
+    return path if relative.startswith("..") else relative
+
+
+def fmt_kb(size: float) -> str:
+    if abs(size) >= 1024 * 1024:
+        return f"{size / 1024 / 1024:.1f} MiB"
+    return f"{size / 1024:.1f} KiB"
+
+
+class MemoryProfile:
+    def __init__(self, config):
+        self.top = config.getoption("memory_top")
+        self.leak_threshold = config.getoption("memory_leak_kb") * 1024
+        self.tests: dict[str, dict] = {}
+        # Keyed by (name, defining module): conftests may reuse a fixture name
+        self.fixtures: dict[tuple[str, str], dict] = {}
+        self.baseline: tracemalloc.Snapshot | None = None
+        self.start_memory = 0
+        # Peak seen before a fixture reset the tracemalloc peak mid-test
+        self.peak_floor = 0
+        # Memory retained by broader-scoped fixtures set up during this test
+        self.held_by_fixtures = 0
+        # --profile-dir is defined by pytest_per_test_profile, when loaded
+        self.profile_dir = Path(config.getoption("profile_dir", PROFILE_DIR))
+
+    def pytest_sessionstart(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtestloop(self):
+        self.baseline = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+        self.start_memory = tracemalloc.get_traced_memory()[0]
+        yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item):
+        before = tracemalloc.get_traced_memory()[0]
+        self.peak_floor = 0
+        self.held_by_fixtures = 0
+        tracemalloc.reset_peak()
+        yield
+        current, peak = tracemalloc.get_traced_memory()
+        retained = current - before
+        self.tests[item.nodeid] = {
+            "peak": max(peak, self.peak_floor) - before,
+            "retained": retained,
+            "unexplained": retained - self.held_by_fixtures,
+            "after": current,
+        }
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef):
+        before, peak_so_far = tracemalloc.get_traced_memory()
+        self.peak_floor = max(self.peak_floor, peak_so_far)
+        tracemalloc.reset_peak()
+        yield
+        current, peak = tracemalloc.get_traced_memory()
+        self.peak_floor = max(self.peak_floor, peak)
+        allocated = current - before
+        if fixturedef.scope != "function":
+            self.held_by_fixtures += allocated
+
+        entry = self.fixtures.setdefault(
+            fixture_key(fixturedef),
+            {"scope": fixturedef.scope, "count": 0, "allocated": 0, "peak": 0},
+        )
+        entry["count"] += 1
+        entry["allocated"] += allocated
+        entry["peak"] = max(entry["peak"], peak - before)
+
+    def build_report(self, growth_sites: list) -> list[str]:
+        top = self.top
+        lines = ["## Memory Profile", ""]
+        end_memory = tracemalloc.get_traced_memory()[0]
+        growth = end_memory - self.start_memory
+        lines.append(
+            f"Traced memory: {fmt_kb(self.start_memory)} before tests, "
+            f"{fmt_kb(end_memory)} after ({fmt_kb(growth)} growth over "
+            f"{len(self.tests)} tests)"
+        )
+        lines.append("")
+
+        lines.append("### Highest Peak per Test")
+        lines.append("| Test | Peak | Retained |")
+        lines.append("|---|---|---|")
+        by_peak = sorted(self.tests.items(), key=lambda kv: kv[1]["peak"], reverse=True)
+        for nodeid, t in by_peak[:top]:
+            lines.append(
+                f"| {nodeid} | {fmt_kb(t['peak'])} | {fmt_kb(t['retained'])} |"
+            )
+        lines.append("")
+
+        leaks = sorted(
+            (
+                kv
+                for kv in self.tests.items()
+                if kv[1]["unexplained"] >= self.leak_threshold
+            ),
+            key=lambda kv: kv[1]["unexplained"],
+            reverse=True,
+        )
+        lines.append(f"### Potential Leaks (≥ {fmt_kb(self.leak_threshold)} retained)")
+        if leaks:
+            lines.append(
+                "Memory still allocated after teardown, excluding broader-scoped "
+                "fixtures set up during the test:"
+            )
+            lines.append("")
+            lines.append("| Test | Retained | Traced after test |")
+            lines.append("|---|---|---|")
+            for nodeid, t in leaks[:top]:
+                lines.append(
+                    f"| {nodeid} | {fmt_kb(t['unexplained'])} | {fmt_kb(t['after'])} |"
+                )
+        else:
+            lines.append("*None.*")
+        lines.append("")
+
+        lines.append("### Fixtures by Allocated Memory")
+        lines.append(
+            "| Fixture | Defined in | Scope | Instances | Allocated (total) | Max peak |"
+        )
+        lines.append("|---|---|---|---|---|---|")
+        by_alloc = sorted(
+            self.fixtures.items(), key=lambda kv: kv[1]["allocated"], reverse=True
+        )
+        for (name, module), f in by_alloc[:top]:
+            lines.append(
+                f"| `{name}` | {module} | {f['scope']} | {f['count']} "
+                f"| {fmt_kb(f['allocated'])} | {fmt_kb(f['peak'])} |"
+            )
+        lines.append("")
+
+        lines.append("### Top Allocation Sites (growth during tests)")
+        lines.append("| Site | Growth | Blocks |")
+        lines.append("|---|---|---|")
+        for stat in growth_sites[:top]:
+            frame = stat.traceback[0]
+            lines.append(
+                f"| {display_path(frame.filename)}:{frame.lineno} "
+                f"| {fmt_kb(stat.size_diff)} | {stat.count_diff:+d} |"
+            )
+        lines.append("")
+        return lines
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.tests or self.baseline is None:
+            return
+        snapshot = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+        growth_sites = [
+            stat
+            for stat in snapshot.compare_to(self.baseline, "lineno")
+            if stat.size_diff > 0
+        ]
+        report = self.build_report(growth_sites)
+
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = self.profile_dir / f"memory-{stamp}.json"
+        fixtures = [
+            {"fixture": name, "module": module, **f}
+            for (name, module), f in self.fixtures.items()
+        ]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"tests": self.tests, "fixtures": fixtures}, f, indent=2)
+            f.write("\n")
+
+        terminalreporter.write_sep("=", "memory profile")
+        for line in report:
+            terminalreporter.write_line(line)
+        terminalreporter.write_line(f"Memory profile written to {path}")
@@ -0,0 +1,186 @@
+"""pytest plugin that profiles each test separately with pyinstrument.
+
+Every test (setup, call and teardown) runs under its own profiler instead of
+one tree blending collection, fixtures and all tests together. At the end of
+the session the plugin writes, for the N slowest tests, a hotspot summary and
+the pyinstrument session (comparable with profile_diff.py), plus a ranked
+table of the functions that dominate self time across the whole suite.
+
+Enable with:
+  PYTHONPATH=<scripts dir> pytest -p pytest_per_test_profile --profile-per-test
+"""
+
+import hashlib
+import heapq
+import json
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from profile_diff import build_summary, fmt_ms, function_times
+from pyinstrument import Profiler
+
+PROFILE_DIR = Path(os.environ.get("PYTEST_PROFILE_DIR", ".pytest-profiles"))
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("per-test-profile", "per-test profiling")
+    group.addoption(
+        "--profile-per-test",
+        action="store_true",
+        help="Profile each test separately with pyinstrument",
+    )
+    group.addoption(
+        "--profile-top",
+        type=int,
+        default=20,
+        help="Write hotspot summaries for the N slowest tests (default: 20)",
+    )
+    group.addoption(
+        "--profile-functions",
+        type=int,
+        default=10,
+        help="Functions listed per test and in the suite table (default: 10)",
+    )
+    group.addoption(
+        "--profile-dir",
+        default=PROFILE_DIR,
+        type=Path,
+        help="Directory for profile output (default: $PYTEST_PROFILE_DIR "
+        "or .pytest-profiles)",
+    )
+    group.addoption(
+        "--profile-only",
+        action="append",
+        metavar="NODEID",
+        help="Run only this test, deselecting the rest of the selection (repeatable)",
+    )
+
+
+def pytest_configure(config):
+    if config.getoption("profile_per_test"):
+        config.pluginmanager.register(PerTestProfiler(config), "per-test-profiler")
+
+
+def pytest_collection_modifyitems(config, items):
+    only = config.getoption("profile_only")
+    if not only:
+        return
+    selected, deselected, seen = [], [], set()
+    for item in items:
+        # A nodeid also matched by a path argument is collected twice
+        if item.nodeid in only and item.nodeid not in seen:
+            seen.add(item.nodeid)
+            selected.append(item)
+        else:
+            deselected.append(item)
+    config.hook.pytest_deselected(items=deselected)
+    items[:] = selected
+
+
+def slugify(nodeid: str) -> str:
+    """File name for a nodeid; the digest keeps truncated or similar ids apart."""
+    digest = hashlib.sha1(nodeid.encode()).hexdigest()[:8]
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", nodeid).strip("_")[:140] + f"-{digest}"
+
+
+class PerTestProfiler:
+    def __init__(self, config):
+        self.top = config.getoption("profile_top")
+        self.functions = config.getoption("profile_functions")
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.output_dir = config.getoption("profile_dir") / f"per-test-{stamp}"
+        # Min-heap of (duration, nodeid, session) holding the slowest tests
+        self.slowest: list[tuple[float, str, dict]] = []
+        # Suite-wide totals per function: self/cumulative seconds, test count
+        self.suite: dict[str, dict[str, float]] = {}
+        self.test_count = 0
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item):
+        profiler = Profiler(async_mode="disabled")
+        profiler.start()
+        try:
+            yield
+        finally:
+            session = profiler.stop().to_json()
+            self.record(item.nodeid, session)
+
+    def record(self, nodeid: str, session: dict) -> None:
+        self.test_count += 1
+        for name, t in function_times(session).items():
+            entry = self.suite.setdefault(
+                name, {"self": 0.0, "cumulative": 0.0, "tests": 0}
+            )
+            entry["self"] += t["self"]
+            entry["cumulative"] += t["cumulative"]
+            entry["tests"] += 1
+
+        item = (session.get("duration", 0.0), nodeid, session)
+        if len(self.slowest) < self.top:
+            heapq.heappush(self.slowest, item)
+        elif item[0] > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, item)
+
+    def build_suite_table(self) -> list[str]:
+        ranked = sorted(self.suite.items(), key=lambda kv: kv[1]["self"], reverse=True)
+        lines = [
+            f"## Functions Dominating Test Time ({self.test_count} tests)",
+            "",
+            "| Function | Self (total) | Cumulative (total) | Tests |",
+            "|---|---|---|---|",
+        ]
+        for name, t in ranked[: self.functions]:
+            lines.append(
+                f"| `{name}` | {fmt_ms(t['self'])} | {fmt_ms(t['cumulative'])} "
+                f"| {t['tests']} |"
+            )
+        lines.append("")
+        return lines
+
+    def build_slowest_table(self) -> list[str]:
+        lines = [
+            f"## Slowest Tests (top {len(self.slowest)})",
+            "",
+            "| Test | Duration | Top function (self) | Summary |",
+            "|---|---|---|---|",
+        ]
+        for duration, nodeid, session in sorted(self.slowest, reverse=True):
+            times = function_times(session)
+            hotspot = "—"
+            if times:
+                name, top = max(times.items(), key=lambda kv: kv[1]["self"])
+                hotspot = f"`{name}` {fmt_ms(top['self'])}"
+            lines.append(
+                f"| {nodeid} | {duration * 1000:.0f}ms | {hotspot} "
+                f"| {slugify(nodeid)}.md |"
+            )
+        lines.append("")
+        return lines
+
+    def write_outputs(self) -> list[str]:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        for _, nodeid, session in self.slowest:
+            slug = slugify(nodeid)
+            summary = [f"# {nodeid}", ""] + build_summary(session, self.functions)
+            (self.output_dir / f"{slug}.md").write_text(
+                "\n".join(summary), encoding="utf-8"
+            )
+            session_path = self.output_dir / f"{slug}.pyisession"
+            with open(session_path, "w", encoding="utf-8") as f:
+                json.dump(session, f)
+
+        report = self.build_slowest_table() + self.build_suite_table()
+        (self.output_dir / "summary.md").write_text("\n".join(report), encoding="utf-8")
+        return report
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.test_count:
+            return
+        report = self.write_outputs()
+        terminalreporter.write_sep("=", "per-test profile")
+        for line in report:
+            terminalreporter.write_line(line)
+        terminalreporter.write_line(f"Profiles written to {self.output_dir}")
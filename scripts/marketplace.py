@@ -6,7 +6,15 @@
 
 """Marketplace CLI for managing Claude Code plugins."""
 
+import bisect
+import hashlib
 import json
+import math
+import os
+import re
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Annotated, Optional
 
@@ -17,6 +25,23 @@ from rich.table import Table
 app = typer.Typer(help="CLI for managing the Claude Code plugin marketplace")
 console = Console()
 
+# plugin.json cache for sync, kept next to marketplace.json
+PLUGIN_CACHE_FILENAME = ".marketplace-cache.json"
+PLUGIN_CACHE_VERSION = 1
+
+# Inverted index for search, kept next to marketplace.json
+SEARCH_INDEX_FILENAME = ".marketplace-index.json"
+SEARCH_INDEX_VERSION = 2
+SEARCH_FIELD_WEIGHTS = {
+    "name": 5.0,
+    "keywords": 3.0,
+    "tags": 2.0,
+    "category": 2.0,
+    "description": 1.0,
+}
+# Query terms also match indexed terms they are a prefix of, at a lower weight
+SEARCH_PREFIX_WEIGHT = 0.5
+
 
 def find_repo_root(start: Path) -> Optional[Path]:
     """
@@ -60,22 +85,61 @@ def load_marketplace(path: Path) -> dict:
         raise typer.Exit(1)
 
 
+def write_json_atomic(path: Path, data: dict) -> None:
+    """
+    Write JSON (2-space indent + trailing newline) through a temporary file.
+
+    The temporary file is created in the same directory and moved into place, so
+    readers never see a partially written file. It gets the permissions of the
+    file it replaces, or the umask default for a new file (temporary files are
+    created private).
+
+    Args:
+        path: Destination path
+        data: Dictionary to serialize
+
+    Raises:
+        OSError: If the file cannot be written
+    """
+    tmp_path = None
+    try:
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=path.parent, suffix=".tmp", delete=False
+        ) as f:
+            tmp_path = f.name
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        try:
+            shutil.copymode(path, tmp_path)
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
 def save_marketplace(path: Path, data: dict) -> None:
     """
     Save marketplace.json with consistent formatting (2-space indent + trailing newline).
 
+    The write is atomic: an interrupted or failed save leaves the previous file intact.
+
     Args:
         path: Path to marketplace.json file
         data: Dictionary to serialize
     """
     try:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-            f.write("\n")
+        write_json_atomic(path, data)
     except Exception as e:
         console.print(f"[red]Error: Failed to write {path}: {e}[/red]")
         raise typer.Exit(1)
 
+    update_search_index(path, data)
+
 
 def load_plugin_json(plugin_dir: Path) -> dict:
     """
@@ -99,6 +163,109 @@ def load_plugin_json(plugin_dir: Path) -> dict:
         raise typer.Exit(1)
 
 
+def read_plugin_json(plugin_json_path: Path, cached: Optional[dict] = None) -> dict:
+    """
+    Read plugin.json, reusing the cached copy if the file is unchanged.
+
+    Unlike load_plugin_json, errors are raised instead of reported, so this can
+    run in worker threads.
+
+    Args:
+        plugin_json_path: Path to plugin.json
+        cached: Previous cache entry for this path, if any
+
+    Returns:
+        Cache entry with the file's mtime_ns, size and parsed data (the cached
+        entry itself if the file is unchanged)
+
+    Raises:
+        OSError: If the file cannot be read
+        json.JSONDecodeError: If the file is not valid JSON
+    """
+    stat = plugin_json_path.stat()
+    if (
+        cached is not None
+        and cached.get("mtime_ns") == stat.st_mtime_ns
+        and cached.get("size") == stat.st_size
+    ):
+        return cached
+
+    with open(plugin_json_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "data": data}
+
+
+def load_plugin_cache(path: Path) -> dict:
+    """
+    Load the plugin.json cache, ignoring a missing, corrupt or outdated cache.
+
+    Args:
+        path: Path to the cache file
+
+    Returns:
+        Mapping of plugin.json path to cache entry
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("version") != PLUGIN_CACHE_VERSION:
+        return {}
+    return cache.get("files", {})
+
+
+def read_plugin_jsons(marketplace_path: Path, plugin_dirs: dict) -> tuple[dict, int]:
+    """
+    Read plugin.json for many plugins concurrently, skipping unchanged files.
+
+    Files whose path, mtime and size match the cache next to marketplace.json are
+    not read again. The cache is rewritten with the files read by this call.
+
+    Args:
+        marketplace_path: Path to marketplace.json file
+        plugin_dirs: Mapping of keys (e.g. plugin names) to plugin directories
+
+    Returns:
+        Tuple of (mapping of key to plugin.json data, or to the exception raised
+        while reading it; number of files served from the cache)
+    """
+    cache_path = marketplace_path.parent / PLUGIN_CACHE_FILENAME
+    cache = load_plugin_cache(cache_path)
+    paths = {
+        key: str(plugin_dir / ".claude-plugin" / "plugin.json")
+        for key, plugin_dir in plugin_dirs.items()
+    }
+
+    # Reads are I/O-bound (network storage): threads overlap the latency
+    with ThreadPoolExecutor() as pool:
+        futures = {
+            key: pool.submit(read_plugin_json, Path(path), cache.get(path))
+            for key, path in paths.items()
+        }
+
+    results = {}
+    new_cache = {}
+    cache_hits = 0
+    for key, future in futures.items():
+        try:
+            entry = future.result()
+        except (OSError, json.JSONDecodeError) as e:
+            results[key] = e
+            continue
+        if entry is cache.get(paths[key]):
+            cache_hits += 1
+        new_cache[paths[key]] = entry
+        results[key] = entry["data"]
+
+    try:
+        write_json_atomic(cache_path, {"version": PLUGIN_CACHE_VERSION, "files": new_cache})
+    except OSError:
+        pass  # The cache is an optimization: a read-only checkout still syncs
+
+    return results, cache_hits
+
+
 def find_plugin_entry(marketplace: dict, name: str) -> Optional[tuple[int, dict]]:
     """
     Find a plugin entry in the marketplace by name.
@@ -117,6 +284,329 @@ def find_plugin_entry(marketplace: dict, name: str) -> Optional[tuple[int, dict]
     return None
 
 
+def index_plugins(marketplace: dict) -> dict[str, dict]:
+    """
+    Build a name-indexed view of the marketplace plugin entries.
+
+    The entries are shared with the marketplace data, so changes made through
+    the index are saved with it.
+
+    Args:
+        marketplace: Marketplace data dictionary
+
+    Returns:
+        Dictionary mapping plugin name to its entry
+    """
+    return {entry.get("name"): entry for entry in marketplace.get("plugins", [])}
+
+
+def resolve_plugin_dir(repo_root: Path, source: str) -> Path:
+    """
+    Resolve a marketplace source field to the plugin directory.
+
+    Args:
+        repo_root: Path to the repo root
+        source: Source path from the marketplace entry (e.g. "./my-plugin")
+
+    Returns:
+        Path to the plugin directory
+    """
+    # Remove leading "./" if present
+    return repo_root / source.lstrip("./")
+
+
+def split_list(value: Optional[str | list]) -> list[str]:
+    """
+    Normalize a comma-separated string or a list into a list of stripped values.
+
+    Args:
+        value: Comma-separated string, list of strings, or None
+
+    Returns:
+        List of non-empty values
+    """
+    if not value:
+        return []
+    items = value.split(",") if isinstance(value, str) else value
+    return [item.strip() for item in items if item.strip()]
+
+
+def validate_plugin_data(plugin_data: dict, plugin_json_path: Path) -> None:
+    """
+    Check that plugin.json has the fields a marketplace entry requires.
+
+    Args:
+        plugin_data: Parsed plugin.json data
+        plugin_json_path: Path to plugin.json (for error messages)
+    """
+    for field in ("name", "description", "version"):
+        if not plugin_data.get(field):
+            console.print(f"[red]Error: '{field}' field missing in {plugin_json_path}[/red]")
+            raise typer.Exit(1)
+
+
+def build_plugin_entry(
+    plugin_data: dict,
+    source: str,
+    category: str,
+    keywords: list[str],
+    tags: list[str],
+) -> dict:
+    """
+    Build a marketplace entry from plugin.json data and catalog fields.
+
+    Args:
+        plugin_data: Parsed plugin.json data, checked with validate_plugin_data
+        source: Source path of the plugin
+        category: Plugin category
+        keywords: Keywords (omitted from the entry if empty)
+        tags: Tags (omitted from the entry if empty)
+
+    Returns:
+        New marketplace entry
+    """
+    entry = {
+        "name": plugin_data["name"],
+        "description": plugin_data["description"],
+        "version": plugin_data["version"],
+        "source": source,
+        "category": category,
+    }
+
+    if keywords:
+        entry["keywords"] = keywords
+
+    if tags:
+        entry["tags"] = tags
+
+    if plugin_data.get("license"):
+        entry["license"] = plugin_data["license"]
+
+    return entry
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Split text into lowercase alphanumeric search terms.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List of terms
+    """
+    return re.findall(r"[a-z0-9]+", text.lower())
+
+
+def entry_terms(entry: dict) -> dict[str, float]:
+    """
+    Compute the weighted search terms of a marketplace entry.
+
+    A term's weight is the sum of the weights of the fields it appears in.
+
+    Args:
+        entry: Marketplace plugin entry
+
+    Returns:
+        Mapping of term to weight
+    """
+    terms: dict[str, float] = {}
+    for field, weight in SEARCH_FIELD_WEIGHTS.items():
+        value = entry.get(field) or ""
+        text = " ".join(value) if isinstance(value, list) else str(value)
+        for term in set(tokenize(text)):
+            terms[term] = terms.get(term, 0.0) + weight
+    return terms
+
+
+def entry_fingerprint(entry: dict) -> str:
+    """
+    Fingerprint the fields of an entry that the search index stores.
+
+    Args:
+        entry: Marketplace plugin entry
+
+    Returns:
+        Hex digest that changes whenever an indexed or displayed field changes
+    """
+    fields = {field: entry.get(field) for field in [*SEARCH_FIELD_WEIGHTS, "version"]}
+    return hashlib.sha1(json.dumps(fields, sort_keys=True).encode()).hexdigest()
+
+
+def load_search_index(path: Path) -> dict:
+    """
+    Load the search index, returning an empty index if it is missing or outdated.
+
+    Args:
+        path: Path to the index file
+
+    Returns:
+        Index with "entries" (name to fingerprint, terms and display fields),
+        "postings" (term to name to weight), "vocabulary" (sorted terms, for
+        prefix lookups) and the marketplace.json stat it was built from
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        index = None
+    if not isinstance(index, dict) or index.get("version") != SEARCH_INDEX_VERSION:
+        index = {
+            "version": SEARCH_INDEX_VERSION,
+            "entries": {},
+            "postings": {},
+            "vocabulary": [],
+        }
+    return index
+
+
+def update_search_index(marketplace_path: Path, marketplace: dict) -> dict:
+    """
+    Bring the search index up to date with the marketplace, incrementally.
+
+    Only entries whose fingerprint changed (or that were added or removed) have
+    their postings rewritten. The index is saved next to marketplace.json; a
+    failure to save it is ignored, since search can rebuild it.
+
+    Args:
+        marketplace_path: Path to marketplace.json file
+        marketplace: Marketplace data dictionary, as saved at marketplace_path
+
+    Returns:
+        Updated index
+    """
+    index_path = marketplace_path.parent / SEARCH_INDEX_FILENAME
+    index = load_search_index(index_path)
+    entries = index["entries"]
+    postings = index["postings"]
+    vocabulary = index["vocabulary"]
+
+    def remove(name: str) -> None:
+        for term in entries.pop(name)["terms"]:
+            postings[term].pop(name, None)
+            if not postings[term]:
+                del postings[term]
+                del vocabulary[bisect.bisect_left(vocabulary, term)]
+
+    current = index_plugins(marketplace)
+    for name in [name for name in entries if name not in current]:
+        remove(name)
+
+    for name, entry in current.items():
+        if not name:
+            continue
+        fingerprint = entry_fingerprint(entry)
+        if name in entries and entries[name]["fingerprint"] == fingerprint:
+            continue
+        if name in entries:
+            remove(name)
+        terms = entry_terms(entry)
+        entries[name] = {
+            "fingerprint": fingerprint,
+            "terms": sorted(terms),
+            "version": entry.get("version") or "",
+            "category": entry.get("category") or "",
+            "description": entry.get("description") or "",
+        }
+        for term, weight in terms.items():
+            if term not in postings:
+                bisect.insort(vocabulary, term)
+            postings.setdefault(term, {})[name] = weight
+
+    stat = marketplace_path.stat()
+    index["source"] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+    try:
+        write_json_atomic(index_path, index)
+    except OSError:
+        pass
+    return index
+
+
+def search_index(
+    index: dict, query: str, category: Optional[str] = None
+) -> list[tuple[str, float]]:
+    """
+    Rank indexed plugins against a multi-term query.
+
+    Every query term must match (exactly, or as a prefix of an indexed term).
+    Each match scores the term's field weight times its inverse document
+    frequency, so rare terms count more than common ones.
+
+    Args:
+        index: Search index from update_search_index
+        query: Query text (may be empty when filtering by category)
+        category: Only return plugins in this category (case-insensitive)
+
+    Returns:
+        List of (name, score) tuples, best match first
+    """
+    entries = index["entries"]
+    postings = index["postings"]
+    candidates = set(entries)
+    if category is not None:
+        candidates = {
+            name
+            for name in candidates
+            if (entries[name]["category"] or "").lower() == category.lower()
+        }
+
+    vocabulary = index["vocabulary"]
+    scores = dict.fromkeys(candidates, 0.0)
+    for query_term in set(tokenize(query)):
+        matched: dict[str, float] = {}
+        start = bisect.bisect_left(vocabulary, query_term)
+        for term in vocabulary[start:]:
+            if not term.startswith(query_term):
+                break
+            idf = math.log(1 + len(entries) / len(postings[term]))
+            factor = 1.0 if term == query_term else SEARCH_PREFIX_WEIGHT
+            for name, weight in postings[term].items():
+                if name in candidates:
+                    score = weight * idf * factor
+                    matched[name] = max(matched.get(name, 0.0), score)
+        candidates &= matched.keys()
+        for name in candidates:
+            scores[name] += matched[name]
+
+    return sorted(
+        ((name, scores[name]) for name in candidates), key=lambda r: (-r[1], r[0])
+    )
+
+
+def load_manifest(path: Path) -> list[dict]:
+    """
+    Load a plugin manifest for the apply command.
+
+    The manifest is a JSON list of objects (or an object with a "plugins" list),
+    each with a "name" and optional "source", "category", "keywords" and "tags".
+
+    Args:
+        path: Path to the manifest file
+
+    Returns:
+        List of manifest items
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        console.print(f"[red]Error: Manifest not found at {path}[/red]")
+        raise typer.Exit(1)
+    except json.JSONDecodeError as e:
+        console.print(f"[red]Error: Invalid JSON in {path}: {e}[/red]")
+        raise typer.Exit(1)
+
+    items = manifest.get("plugins") if isinstance(manifest, dict) else manifest
+    if not isinstance(items, list) or not all(
+        isinstance(item, dict) and item.get("name") for item in items
+    ):
+        console.print(
+            f"[red]Error: {path} must be a list of plugin objects, each with a 'name'.[/red]"
+        )
+        raise typer.Exit(1)
+    return items
+
+
 @app.callback()
 def main(
     ctx: typer.Context,
@@ -148,8 +638,8 @@ def main(
     ctx.obj = {"marketplace_path": marketplace}
 
 
-@app.command()
-def list(ctx: typer.Context):
+@app.command(name="list")
+def list_plugins(ctx: typer.Context):
     """List all plugins in the marketplace."""
     marketplace_path = ctx.obj["marketplace_path"]
     marketplace_data = load_marketplace(marketplace_path)
@@ -182,6 +672,67 @@ def list(ctx: typer.Context):
     console.print(table)
 
 
+@app.command()
+def search(
+    ctx: typer.Context,
+    query: Annotated[
+        Optional[str], typer.Argument(help="Search terms (all must match)")
+    ] = None,
+    category: Annotated[
+        Optional[str], typer.Option("--category", "-c", help="Only plugins in this category")
+    ] = None,
+    limit: Annotated[int, typer.Option("--limit", "-n", help="Maximum results")] = 20,
+):
+    """Search plugins by name, keywords, tags, category and description."""
+    if not query and category is None:
+        console.print("[red]Error: Specify a query, --category, or both.[/red]")
+        raise typer.Exit(1)
+    if query and not tokenize(query):
+        console.print("[red]Error: The query has no searchable terms (letters or digits).[/red]")
+        raise typer.Exit(1)
+
+    marketplace_path = ctx.obj["marketplace_path"]
+    index = load_search_index(marketplace_path.parent / SEARCH_INDEX_FILENAME)
+
+    # Rebuild if marketplace.json changed outside this CLI (e.g. edited by hand)
+    try:
+        stat = marketplace_path.stat()
+    except FileNotFoundError:
+        console.print(f"[red]Error: marketplace.json not found at {marketplace_path}[/red]")
+        raise typer.Exit(1)
+    if index.get("source") != {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}:
+        index = update_search_index(marketplace_path, load_marketplace(marketplace_path))
+
+    results = search_index(index, query or "", category)
+    if not results:
+        console.print("[yellow]No matching plugins.[/yellow]")
+        return
+
+    title = f"Search: {query}" if query else "Search"
+    if category is not None:
+        title += f" (category: {category})"
+    table = Table(title=title)
+    table.add_column("Name", style="cyan", no_wrap=True)
+    table.add_column("Version", style="magenta")
+    table.add_column("Category", style="green")
+    table.add_column("Score", style="blue", justify="right")
+    table.add_column("Description", style="white")
+
+    for name, score in results[:limit]:
+        entry = index["entries"][name]
+        description = entry["description"]
+
+        # Truncate description to ~60 chars
+        if len(description) > 60:
+            description = description[:57] + "..."
+
+        table.add_row(name, entry["version"], entry["category"], f"{score:.1f}", description)
+
+    console.print(table)
+    if len(results) > limit:
+        console.print(f"[dim]{len(results) - limit} more result(s); use --limit to show them.[/dim]")
+
+
 @app.command()
 def add(
     ctx: typer.Context,
@@ -227,16 +778,8 @@ def add(
 
     # 3. Read plugin.json
     plugin_data = load_plugin_json(plugin_dir)
-
-    # Extract required fields
-    plugin_name = plugin_data.get("name")
-    plugin_description = plugin_data.get("description")
-    plugin_version = plugin_data.get("version")
-    plugin_license = plugin_data.get("license")
-
-    if not plugin_name:
-        console.print(f"[red]Error: 'name' field missing in {plugin_json_path}[/red]")
-        raise typer.Exit(1)
+    validate_plugin_data(plugin_data, plugin_json_path)
+    plugin_name = plugin_data["name"]
 
     if plugin_name != name:
         console.print(
@@ -244,14 +787,6 @@ def add(
             f"plugin.json name '{plugin_name}'. Using plugin.json name.[/yellow]"
         )
 
-    if not plugin_description:
-        console.print(f"[red]Error: 'description' field missing in {plugin_json_path}[/red]")
-        raise typer.Exit(1)
-
-    if not plugin_version:
-        console.print(f"[red]Error: 'version' field missing in {plugin_json_path}[/red]")
-        raise typer.Exit(1)
-
     # 4. Set defaults and prompt for missing required fields
     if source is None:
         source = f"./{name}"
@@ -259,34 +794,16 @@ def add(
     if category is None:
         category = typer.prompt("Category")
 
-    # 5. Parse comma-separated fields (handle empty strings)
-    keywords_list = []
-    if keywords:
-        keywords_list = [k.strip() for k in keywords.split(",") if k.strip()]
-
-    tags_list = []
-    if tags:
-        tags_list = [t.strip() for t in tags.split(",") if t.strip()]
-
-    # 6. Build new plugin entry
-    new_entry = {
-        "name": plugin_name,
-        "description": plugin_description,
-        "version": plugin_version,
-        "source": source,
-        "category": category,
-    }
-
-    if keywords_list:
-        new_entry["keywords"] = keywords_list
-
-    if tags_list:
-        new_entry["tags"] = tags_list
-
-    if plugin_license:
-        new_entry["license"] = plugin_license
+    # 5. Build new plugin entry
+    new_entry = build_plugin_entry(
+        plugin_data,
+        source,
+        category,
+        split_list(keywords),
+        split_list(tags),
+    )
 
-    # 7. Append to marketplace and save
+    # 6. Append to marketplace and save
     if "plugins" not in marketplace_data:
         marketplace_data["plugins"] = []
 
@@ -296,19 +813,183 @@ def add(
     console.print(f"[green]Successfully added plugin '{plugin_name}' to marketplace.[/green]")
 
 
+@app.command()
+def apply(
+    ctx: typer.Context,
+    manifest: Annotated[Path, typer.Argument(help="JSON manifest of plugins to add or update")],
+    dry_run: Annotated[
+        bool,
+        typer.Option("--dry-run", help="Show changes without writing them"),
+    ] = False,
+):
+    """Add or update many plugins from a manifest, with a single write."""
+    marketplace_path = ctx.obj["marketplace_path"]
+    repo_root = marketplace_path.parent.parent
+    items = load_manifest(manifest)
+
+    marketplace_data = load_marketplace(marketplace_path)
+    marketplace_data.setdefault("plugins", [])
+    plugins_by_name = index_plugins(marketplace_data)
+
+    added = []
+    updated = []
+
+    # Every item is validated before anything is written: an error leaves
+    # marketplace.json untouched.
+    for item in items:
+        name = item["name"]
+        existing = plugins_by_name.get(name)
+        source = item.get("source") or (existing or {}).get("source") or f"./{name}"
+
+        plugin_dir = resolve_plugin_dir(repo_root, source)
+        plugin_json_path = plugin_dir / ".claude-plugin" / "plugin.json"
+        plugin_data = load_plugin_json(plugin_dir)
+        validate_plugin_data(plugin_data, plugin_json_path)
+
+        if plugin_data["name"] != name:
+            console.print(
+                f"[red]Error: Manifest name '{name}' does not match "
+                f"plugin.json name '{plugin_data['name']}' in {plugin_json_path}[/red]"
+            )
+            raise typer.Exit(1)
+
+        if existing is None:
+            category = item.get("category")
+            if not category:
+                console.print(f"[red]Error: New plugin '{name}' needs a 'category' in the manifest.[/red]")
+                raise typer.Exit(1)
+            new_entry = build_plugin_entry(
+                plugin_data,
+                source,
+                category,
+                split_list(item.get("keywords")),
+                split_list(item.get("tags")),
+            )
+            marketplace_data["plugins"].append(new_entry)
+            plugins_by_name[name] = new_entry
+            added.append(name)
+            console.print(f"  [cyan]{name}[/cyan]: added")
+            continue
+
+        # Catalog fields not given in the manifest keep their current values
+        new_entry = build_plugin_entry(
+            plugin_data,
+            source,
+            item.get("category") or existing.get("category"),
+            split_list(item.get("keywords", existing.get("keywords"))),
+            split_list(item.get("tags", existing.get("tags"))),
+        )
+        changed = {
+            field
+            for field in ("description", "version", "source", "category", "keywords", "tags", "license")
+            if existing.get(field) != new_entry.get(field)
+        }
+        if changed:
+            for field in changed:
+                if field in new_entry:
+                    existing[field] = new_entry[field]
+                else:
+                    del existing[field]
+            updated.append(name)
+            console.print(f"  [cyan]{name}[/cyan]: {', '.join(sorted(changed))}")
+
+    if not dry_run and (added or updated):
+        save_marketplace(marketplace_path, marketplace_data)
+
+    console.print("\n[bold]Summary:[/bold]")
+    verb = "to add" if dry_run else "added"
+    console.print(f"  Plugins {verb}: {len(added)}")
+    verb = "to update" if dry_run else "updated"
+    console.print(f"  Plugins {verb}: {len(updated)}")
+    console.print(f"  Unchanged: {len(items) - len(added) - len(updated)}")
+
+
+def update_all_versions(marketplace_path: Path) -> None:
+    """
+    Update every marketplace entry to the version in its plugin.json, with a single write.
+
+    Args:
+        marketplace_path: Path to marketplace.json file
+    """
+    repo_root = marketplace_path.parent.parent
+    marketplace_data = load_marketplace(marketplace_path)
+
+    updated_count = 0
+    skipped_count = 0
+
+    plugins_by_name = index_plugins(marketplace_data)
+    plugin_dirs = {
+        plugin_name: resolve_plugin_dir(repo_root, entry.get("source") or f"./{plugin_name}")
+        for plugin_name, entry in plugins_by_name.items()
+    }
+    plugin_jsons, _ = read_plugin_jsons(marketplace_path, plugin_dirs)
+
+    for plugin_name, entry in plugins_by_name.items():
+        plugin_data = plugin_jsons[plugin_name]
+        if isinstance(plugin_data, Exception):
+            if not plugin_dirs[plugin_name].exists():
+                console.print(
+                    f"[yellow]Warning: Plugin directory not found for '{plugin_name}' at {plugin_dirs[plugin_name]}, skipping.[/yellow]"
+                )
+            else:
+                console.print(
+                    f"[yellow]Warning: Could not load plugin.json for '{plugin_name}' ({plugin_data}), skipping.[/yellow]"
+                )
+            skipped_count += 1
+            continue
+
+        new_version = plugin_data.get("version")
+        if not new_version:
+            console.print(
+                f"[yellow]Warning: 'version' field missing for '{plugin_name}', skipping.[/yellow]"
+            )
+            skipped_count += 1
+            continue
+
+        current_version = entry.get("version")
+        if current_version != new_version:
+            entry["version"] = new_version
+            console.print(f"  [cyan]{plugin_name}[/cyan]: {current_version} -> {new_version}")
+            updated_count += 1
+
+    if updated_count > 0:
+        save_marketplace(marketplace_path, marketplace_data)
+
+    console.print(
+        f"[green]Updated {updated_count} plugin(s), {skipped_count} skipped.[/green]"
+    )
+
+
 @app.command(name="update-version")
 def update_version(
     ctx: typer.Context,
-    plugin_name: Annotated[str, typer.Argument(help="Plugin name to update")],
+    plugin_name: Annotated[
+        Optional[str], typer.Argument(help="Plugin name to update")
+    ] = None,
     version: Annotated[
         Optional[str],
         typer.Option("--version", "-v", help="New version (read from plugin.json if not provided)"),
     ] = None,
+    all_plugins: Annotated[
+        bool,
+        typer.Option("--all", help="Update every plugin from its plugin.json"),
+    ] = False,
 ):
     """Update the version of a plugin in the marketplace."""
     marketplace_path = ctx.obj["marketplace_path"]
     repo_root = marketplace_path.parent.parent
 
+    if all_plugins:
+        if plugin_name is not None or version is not None:
+            console.print("[red]Error: --all takes no plugin name or --version.[/red]")
+            raise typer.Exit(1)
+        update_all_versions(marketplace_path)
+        return
+
+    if plugin_name is None:
+        console.print("[red]Error: Specify a plugin name or --all.[/red]")
+        raise typer.Exit(1)
+
     # 1. Find plugin in marketplace
     marketplace_data = load_marketplace(marketplace_path)
     plugin_entry = find_plugin_entry(marketplace_data, plugin_name)
@@ -378,38 +1059,38 @@ def sync(
     skipped_count = 0
     missing_count = 0
 
+    plugin_dirs = {}
     for idx, entry in enumerate(plugins):
-        plugin_name = entry.get("name", "")
-        source = entry.get("source", "")
-
         # Derive plugin directory from source field
-        if not source:
+        if not entry.get("source"):
             console.print(
-                f"[yellow]Warning: Plugin '{plugin_name}' has no source field, skipping.[/yellow]"
+                f"[yellow]Warning: Plugin '{entry.get('name', '')}' has no source field, skipping.[/yellow]"
             )
             skipped_count += 1
             continue
 
-        # Remove leading "./" if present
-        source_path = source.lstrip("./")
-        plugin_dir = repo_root / source_path
+        plugin_dirs[idx] = resolve_plugin_dir(repo_root, entry["source"])
 
-        # Check if plugin directory exists
-        if not plugin_dir.exists():
-            console.print(
-                f"[yellow]Warning: Plugin directory not found for '{plugin_name}' at {plugin_dir}, skipping.[/yellow]"
-            )
-            missing_count += 1
-            continue
+    # Read all plugin.json files up front: concurrently, unchanged ones from cache
+    plugin_jsons, cache_hits = read_plugin_jsons(marketplace_path, plugin_dirs)
 
-        # Load plugin.json
-        try:
-            plugin_data = load_plugin_json(plugin_dir)
-        except typer.Exit:
-            console.print(
-                f"[yellow]Warning: Could not load plugin.json for '{plugin_name}', skipping.[/yellow]"
-            )
-            skipped_count += 1
+    for idx, plugin_dir in plugin_dirs.items():
+        entry = plugins[idx]
+        plugin_name = entry.get("name", "")
+        plugin_data = plugin_jsons[idx]
+
+        if isinstance(plugin_data, Exception):
+            # Check if plugin directory exists
+            if not plugin_dir.exists():
+                console.print(
+                    f"[yellow]Warning: Plugin directory not found for '{plugin_name}' at {plugin_dir}, skipping.[/yellow]"
+                )
+                missing_count += 1
+            else:
+                console.print(
+                    f"[yellow]Warning: Could not load plugin.json for '{plugin_name}' ({plugin_data}), skipping.[/yellow]"
+                )
+                skipped_count += 1
             continue
 
         # Compare shared fields
@@ -461,6 +1142,7 @@ def sync(
     console.print(f"  Plugins skipped (errors): {skipped_count}")
     console.print(f"  Plugins skipped (missing): {missing_count}")
     console.print(f"  Total plugins checked: {len(plugins)}")
+    console.print(f"  plugin.json files unchanged (cached): {cache_hits}")
 
 
 if __name__ == "__main__":
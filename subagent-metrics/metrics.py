@@ -8,7 +8,10 @@
 """CLI explorer for subagent-metrics JSONL logs."""
 
 import json
+import math
 
+from collections.abc import Iterator
+from datetime import date, datetime, timedelta
 from pathlib import Path
 from typing import Annotated, Optional
 
@@ -56,6 +59,23 @@ def load_entries() -> list[dict]:
     return entries
 
 
+def iter_entries() -> Iterator[dict]:
+    """Stream entries one line at a time, without loading the whole file."""
+    metrics_file = _state["metrics_file"]
+    if not metrics_file.exists():
+        console.print(f"[dim]No metrics file found at {metrics_file}[/dim]")
+        raise typer.Exit(0)
+    with metrics_file.open(encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Partially written line (e.g. interrupted hook)
+
+
 def truncate(s: str | None, n: int) -> str:
     if not s:
         return ""
@@ -246,5 +266,301 @@ def sessions(
     console.print(table)
 
 
+# Log-scale histogram buckets: percentiles are within ~5% of the exact value
+HISTOGRAM_BASE = 1.1
+GROUP_FIELDS = {"type": "subagent_type", "skill": "skill", "model": "model"}
+
+
+def bucket(value: float) -> int:
+    return -1 if value < 1 else int(math.log(value, HISTOGRAM_BASE))
+
+
+def bucket_value(b: int) -> float:
+    return 0.0 if b < 0 else HISTOGRAM_BASE ** (b + 0.5)
+
+
+def percentile(histogram: dict[int, int], q: float) -> float | None:
+    total = sum(histogram.values())
+    if not total:
+        return None
+    rank = q * total
+    seen = 0
+    for b in sorted(histogram):
+        seen += histogram[b]
+        if seen >= rank:
+            return bucket_value(b)
+    return bucket_value(max(histogram))
+
+
+class Stats:
+    """Mergeable streaming aggregate of subagent calls (constant memory)."""
+
+    __slots__ = (
+        "calls",
+        "tokens",
+        "duration_ms",
+        "rate_tokens",
+        "rate_ms",
+        "token_hist",
+        "duration_hist",
+    )
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.tokens = 0
+        self.duration_ms = 0
+        # Calls with both tokens and duration, for tokens/sec
+        self.rate_tokens = 0
+        self.rate_ms = 0
+        self.token_hist: dict[int, int] = {}
+        self.duration_hist: dict[int, int] = {}
+
+    def add(self, tokens: int | None, duration_ms: int | None) -> None:
+        self.calls += 1
+        if tokens is not None:
+            self.tokens += tokens
+            b = bucket(tokens)
+            self.token_hist[b] = self.token_hist.get(b, 0) + 1
+        if duration_ms is not None:
+            self.duration_ms += duration_ms
+            b = bucket(duration_ms)
+            self.duration_hist[b] = self.duration_hist.get(b, 0) + 1
+        if tokens is not None and duration_ms:
+            self.rate_tokens += tokens
+            self.rate_ms += duration_ms
+
+    def merge(self, other: "Stats") -> "Stats":
+        self.calls += other.calls
+        self.tokens += other.tokens
+        self.duration_ms += other.duration_ms
+        self.rate_tokens += other.rate_tokens
+        self.rate_ms += other.rate_ms
+        for mine, theirs in (
+            (self.token_hist, other.token_hist),
+            (self.duration_hist, other.duration_hist),
+        ):
+            for b, count in theirs.items():
+                mine[b] = mine.get(b, 0) + count
+        return self
+
+    def tokens_per_call(self) -> int | None:
+        counted = sum(self.token_hist.values())
+        return round(self.tokens / counted) if counted else None
+
+    def tokens_per_sec(self) -> float | None:
+        return self.rate_tokens / (self.rate_ms / 1000) if self.rate_ms else None
+
+    def token_percentile(self, q: float) -> int | None:
+        value = percentile(self.token_hist, q)
+        return round(value) if value is not None else None
+
+    def duration_percentile(self, q: float) -> int | None:
+        value = percentile(self.duration_hist, q)
+        return round(value) if value is not None else None
+
+
+def period_key(day: date, period: str) -> str:
+    if period == "day":
+        return day.isoformat()
+    if period == "week":
+        year, week, _ = day.isocalendar()
+        return f"{year}-W{week:02d}"
+    return f"{day.year}-{day.month:02d}"
+
+
+def fmt_rate(rate: float | None) -> str:
+    return f"{rate:,.1f}" if rate is not None else "—"
+
+
+def fmt_change(before: int, after: int) -> str:
+    return f"+{(after - before) / before * 100:.0f}%" if before else "new"
+
+
+def merged(days: dict[date, Stats], start: date, end: date) -> Stats:
+    """Merge the daily stats in [start, end)."""
+    total = Stats()
+    for day, stats in days.items():
+        if start <= day < end:
+            total.merge(stats)
+    return total
+
+
+@app.command()
+def efficiency(
+    by: Annotated[
+        str,
+        typer.Option("--by", help="Comma-separated grouping: type, skill, model."),
+    ] = "type,skill,model",
+    period: Annotated[
+        str, typer.Option(help="Distribution period: day, week, or month.")
+    ] = "week",
+    window: Annotated[
+        int, typer.Option(help="Days per regression window (recent vs previous).")
+    ] = 7,
+    threshold: Annotated[
+        float, typer.Option(help="Flag increases above this percentage.")
+    ] = 20.0,
+    min_calls: Annotated[
+        int, typer.Option(help="Minimum calls per window to compare a group.")
+    ] = 5,
+    model: Annotated[Optional[str], typer.Option(help="Filter by model.")] = None,
+    subagent_type: Annotated[
+        Optional[str], typer.Option("--type", help="Filter by subagent type.")
+    ] = None,
+    skill: Annotated[Optional[str], typer.Option(help="Filter by skill.")] = None,
+) -> None:
+    """Show token efficiency rates, their distribution over time, and regressions."""
+    dims = [d.strip() for d in by.split(",") if d.strip()]
+    if not dims or any(d not in GROUP_FIELDS for d in dims):
+        console.print(
+            f"[red]Invalid --by value: {by}. Use a comma-separated list of "
+            "type, skill, model.[/red]"
+        )
+        raise typer.Exit(1)
+    if period not in ("day", "week", "month"):
+        console.print(
+            f"[red]Invalid --period value: {period}. Choose day, week, or month.[/red]"
+        )
+        raise typer.Exit(1)
+    fields = [GROUP_FIELDS[d] for d in dims]
+
+    # Single streaming pass, hash-grouped by (group, day): every later view
+    # (totals, periods, windows) is a merge of these daily aggregates. Memory
+    # grows with the number of (group, day) pairs, not with the number of calls.
+    daily: dict[tuple, dict[date, Stats]] = {}
+    for e in iter_entries():
+        if model and e.get("model") != model:
+            continue
+        if subagent_type and e.get("subagent_type") != subagent_type:
+            continue
+        if skill and e.get("skill") != skill:
+            continue
+        try:
+            day = datetime.fromisoformat(e.get("ts", "")).date()
+        except (TypeError, ValueError):  # missing, null or malformed timestamp
+            continue
+        key = tuple(e.get(f) or "(none)" for f in fields)
+        days = daily.setdefault(key, {})
+        days.setdefault(day, Stats()).add(e.get("total_tokens"), e.get("duration_ms"))
+
+    if not daily:
+        console.print("[dim]No matching entries.[/dim]")
+        raise typer.Exit(0)
+
+    totals = {key: merged(days, date.min, date.max) for key, days in daily.items()}
+
+    table = Table(title=f"Efficiency by {', '.join(dims)}")
+    for d in dims:
+        table.add_column(d.capitalize(), style="cyan")
+    table.add_column("Calls", justify="right")
+    table.add_column("Total Tokens", justify="right")
+    table.add_column("Tokens/Call", justify="right")
+    table.add_column("p50", justify="right")
+    table.add_column("p90", justify="right")
+    table.add_column("Tokens/s", justify="right")
+    table.add_column("Latency p50", justify="right")
+    table.add_column("Latency p90", justify="right")
+
+    for key, stats in sorted(totals.items(), key=lambda kv: -kv[1].tokens):
+        table.add_row(
+            *key,
+            str(stats.calls),
+            fmt_tokens(stats.tokens),
+            fmt_tokens(stats.tokens_per_call()),
+            fmt_tokens(stats.token_percentile(0.5)),
+            fmt_tokens(stats.token_percentile(0.9)),
+            fmt_rate(stats.tokens_per_sec()),
+            fmt_duration(stats.duration_percentile(0.5)),
+            fmt_duration(stats.duration_percentile(0.9)),
+        )
+
+    console.print(table)
+
+    periods: dict[str, Stats] = {}
+    for days in daily.values():
+        for day, stats in days.items():
+            periods.setdefault(period_key(day, period), Stats()).merge(stats)
+
+    table = Table(title=f"Distribution by {period}")
+    table.add_column("Period", style="dim")
+    table.add_column("Calls", justify="right")
+    table.add_column("Total Tokens", justify="right")
+    table.add_column("Tokens/Call p50", justify="right")
+    table.add_column("Tokens/Call p90", justify="right")
+    table.add_column("Tokens/s", justify="right")
+    table.add_column("Latency p50", justify="right")
+    table.add_column("Latency p90", justify="right")
+
+    for key in sorted(periods):
+        stats = periods[key]
+        table.add_row(
+            key,
+            str(stats.calls),
+            fmt_tokens(stats.tokens),
+            fmt_tokens(stats.token_percentile(0.5)),
+            fmt_tokens(stats.token_percentile(0.9)),
+            fmt_rate(stats.tokens_per_sec()),
+            fmt_duration(stats.duration_percentile(0.5)),
+            fmt_duration(stats.duration_percentile(0.9)),
+        )
+
+    console.print(table)
+
+    # Windows end at the latest logged day, so old logs still compare
+    end = max(day for days in daily.values() for day in days) + timedelta(days=1)
+    split = end - timedelta(days=window)
+    start = split - timedelta(days=window)
+
+    regressions = []
+    for key, days in daily.items():
+        before = merged(days, start, split)
+        after = merged(days, split, end)
+        if before.calls < min_calls or after.calls < min_calls:
+            continue
+        for metric, values, fmt in (
+            (
+                "tokens/call p50",
+                (before.token_percentile(0.5), after.token_percentile(0.5)),
+                fmt_tokens,
+            ),
+            (
+                "latency p50",
+                (before.duration_percentile(0.5), after.duration_percentile(0.5)),
+                fmt_duration,
+            ),
+        ):
+            old, new = values
+            if old is None or new is None:
+                continue
+            if new > old * (1 + threshold / 100):
+                regressions.append(
+                    (key, metric, fmt(old), fmt(new), fmt_change(old, new))
+                )
+
+    title = (
+        f"Regressions: {split.isoformat()}..{(end - timedelta(days=1)).isoformat()} "
+        f"vs previous {window} days"
+    )
+    if not regressions:
+        console.print(
+            f"[green]{title}: none above {threshold:.0f}% "
+            f"(groups with ≥ {min_calls} calls in both windows).[/green]"
+        )
+        return
+
+    table = Table(title=title)
+    for d in dims:
+        table.add_column(d.capitalize(), style="cyan")
+    table.add_column("Metric")
+    table.add_column("Before", justify="right")
+    table.add_column("After", justify="right")
+    table.add_column("Change", style="red", justify="right")
+
+    for key, metric, old, new, change in regressions:
+        table.add_row(*key, metric, old, new, change)
+
+    console.print(table)
+
+
 if __name__ == "__main__":
     app()
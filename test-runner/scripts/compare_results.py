@@ -4,24 +4,80 @@
 Reads:
   - coverage.json        (pytest-cov output)
   - .pytest-report.json  (pytest-json-report output)
-  - .tests-baseline.json (run history, if exists)
+  - .tests-baseline.db   (run history, if exists)
+
+Sharded runs (parallel processes, CI splits) may instead write one file per
+shard: coverage.<N>.json and .pytest-report.<N>.json (N numeric). All shards are
+merged into a single run before comparison.
 
 Outputs:
   - Structured markdown report to stdout
-  - Updates .tests-baseline.json with the current run
-  - Deletes coverage.json and .pytest-report.json after processing
+  - Appends the current run to .tests-baseline.db
+  - Deletes coverage and pytest report files after processing
+
+The baseline is an append-only SQLite store: one row per run plus one row per
+test outcome, indexed by nodeid. History is never rewritten or truncated, and
+the report only reads the most recent runs. A legacy .tests-baseline.json is
+imported the first time the store is created.
+
+With --partial (a run restricted to some tests, e.g. by watch_tests.py), the
+coverage delta and trend are omitted, failures are only compared for the tests
+that ran, and the run is not recorded.
+
+Per-test history queries:
+  compare_results.py --test <nodeid>   outcome history of one test
+  compare_results.py --flaky [N]       N tests with the highest flake rate
 """
 
+import argparse
+import hashlib
 import json
 import os
+import re
+import sqlite3
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
 
 COVERAGE_FILE = "coverage.json"
+COVERAGE_SHARD_RE = re.compile(r"coverage\.(\d+)\.json")
 PYTEST_REPORT_FILE = ".pytest-report.json"
-BASELINE_FILE = ".tests-baseline.json"
-MAX_HISTORY = 10
+PYTEST_REPORT_SHARD_RE = re.compile(r"\.pytest-report\.(\d+)\.json")
+BASELINE_FILE = ".tests-baseline.db"
+LEGACY_BASELINE_FILE = ".tests-baseline.json"
+TREND_RUNS = 5
+FAILING_OUTCOMES = ("failed", "error")
+MAX_FAILURE_OUTPUT = 50_000
+MAX_FAILURE_BLOCK = 4_000
+MAX_LISTED_TESTS = 10
+ADDRESS_RE = re.compile(r"0x[0-9a-fA-F]+")
+LOCATION_RE = re.compile(r"^\S+:\d+: \w")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    percent_covered REAL NOT NULL,
+    covered_lines INTEGER NOT NULL,
+    missing_lines INTEGER NOT NULL,
+    num_statements INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    passed INTEGER NOT NULL,
+    failed INTEGER NOT NULL,
+    error INTEGER NOT NULL,
+    skipped INTEGER NOT NULL,
+    -- 0 for runs imported from the legacy JSON baseline, which only kept
+    -- failing nodeids: passing outcomes are unknown
+    complete INTEGER NOT NULL DEFAULT 1
+);
+CREATE TABLE IF NOT EXISTS results (
+    nodeid TEXT NOT NULL,
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    outcome TEXT NOT NULL,
+    PRIMARY KEY (nodeid, run_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS results_by_run ON results (run_id, outcome);
+"""
 
 
 def load_json(path: str) -> dict | None:
@@ -35,6 +91,103 @@ def load_json(path: str) -> dict | None:
         return None
 
 
+def find_inputs(single: str, shard_re: re.Pattern) -> list[str]:
+    """Return the single-run file and the numbered shards, in shard order.
+
+    Only <name>.<N>.json files count as shards, so unrelated files such as
+    coverage.final.json are neither merged nor deleted. Shards sort
+    numerically (2 before 10): for duplicate nodeids the last shard wins.
+    """
+    paths = [single] if os.path.exists(single) else []
+    shards = []
+    for name in os.listdir("."):
+        match = shard_re.fullmatch(name)
+        if match:
+            shards.append((int(match.group(1)), name))
+    paths.extend(name for _, name in sorted(shards))
+    return paths
+
+
+def merge_coverage(shards: list[dict]) -> dict:
+    """Merge coverage.json shards by unioning executed lines and branches per file.
+
+    Totals cannot be summed across shards: a line executed in one shard and
+    missing in another is covered, so totals are recomputed from the merged
+    per-file line sets.
+    """
+    if len(shards) == 1:
+        return shards[0]
+
+    files: dict[str, dict] = {}
+    for shard in shards:
+        for path, data in shard.get("files", {}).items():
+            merged = files.setdefault(
+                path,
+                {
+                    "executed": set(),
+                    "missing": set(),
+                    "executed_branches": set(),
+                    "missing_branches": set(),
+                },
+            )
+            merged["executed"].update(data.get("executed_lines", []))
+            merged["missing"].update(data.get("missing_lines", []))
+            merged["executed_branches"].update(
+                tuple(b) for b in data.get("executed_branches", [])
+            )
+            merged["missing_branches"].update(
+                tuple(b) for b in data.get("missing_branches", [])
+            )
+
+    covered_lines = 0
+    num_statements = 0
+    covered_branches = 0
+    num_branches = 0
+    for merged in files.values():
+        statements = merged["executed"] | merged["missing"]
+        branches = merged["executed_branches"] | merged["missing_branches"]
+        covered_lines += len(merged["executed"])
+        num_statements += len(statements)
+        covered_branches += len(merged["executed_branches"])
+        num_branches += len(branches)
+
+    denominator = num_statements + num_branches
+    percent = (
+        100.0 * (covered_lines + covered_branches) / denominator
+        if denominator
+        else 100.0
+    )
+    return {
+        "totals": {
+            "percent_covered": percent,
+            "covered_lines": covered_lines,
+            "missing_lines": num_statements - covered_lines,
+            "num_statements": num_statements,
+        }
+    }
+
+
+def merge_reports(shards: list[dict]) -> dict:
+    """Merge pytest-json-report shards into one report.
+
+    A nodeid present in several shards (e.g. rerun in another worker) keeps
+    its last result. The summary is recomputed from the merged test list.
+    """
+    if len(shards) == 1:
+        return shards[0]
+
+    tests: dict[str, dict] = {}
+    for shard in shards:
+        for test in shard.get("tests", []):
+            tests[test.get("nodeid", "")] = test
+
+    summary = {"total": len(tests)}
+    for test in tests.values():
+        outcome = test.get("outcome", "")
+        summary[outcome] = summary.get(outcome, 0) + 1
+    return {"summary": summary, "tests": list(tests.values())}
+
+
 def extract_coverage(data: dict) -> dict:
     totals = data.get("totals", {})
     return {
@@ -49,20 +202,30 @@ def extract_tests(data: dict) -> dict:
     summary = data.get("summary", {})
     failed_tests = []
     failure_details = {}
+    outcomes = {}
 
     for test in data.get("tests", []):
         outcome = test.get("outcome", "")
         nodeid = test.get("nodeid", "")
-        if outcome in ("failed", "error"):
+        outcomes[nodeid] = outcome
+        if outcome in FAILING_OUTCOMES:
             failed_tests.append(nodeid)
-            call = test.get("call", {})
+            # Fixture errors are reported in setup/teardown rather than call
+            phase = next(
+                (
+                    test[name]
+                    for name in ("setup", "call", "teardown")
+                    if test.get(name, {}).get("longrepr")
+                ),
+                test.get("call", {}),
+            )
             detail = {}
-            if call.get("longrepr"):
-                detail["traceback"] = call["longrepr"]
-            if call.get("stdout"):
-                detail["stdout"] = call["stdout"]
-            if call.get("stderr"):
-                detail["stderr"] = call["stderr"]
+            if phase.get("longrepr"):
+                detail["traceback"] = phase["longrepr"]
+            if phase.get("stdout"):
+                detail["stdout"] = phase["stdout"]
+            if phase.get("stderr"):
+                detail["stderr"] = phase["stderr"]
             if detail:
                 failure_details[nodeid] = detail
 
@@ -74,9 +237,176 @@ def extract_tests(data: dict) -> dict:
         "skipped": summary.get("skipped", 0),
         "failed_tests": failed_tests,
         "failure_details": failure_details,
+        "outcomes": outcomes,
+    }
+
+
+def open_baseline(path: str) -> sqlite3.Connection:
+    """Open (creating if needed) the baseline store, importing legacy JSON history."""
+    is_new = not os.path.exists(path)
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    if is_new:
+        legacy = load_json(LEGACY_BASELINE_FILE)
+        if legacy is not None:
+            with conn:
+                # Legacy history is newest-first and only kept failing nodeids
+                for run in reversed(legacy.get("runs", [])):
+                    outcomes = {
+                        nodeid: "failed" for nodeid in run["tests"]["failed_tests"]
+                    }
+                    append_run(conn, run, outcomes, complete=False)
+    return conn
+
+
+def append_run(
+    conn: sqlite3.Connection, run: dict, outcomes: dict, complete: bool = True
+) -> None:
+    """Record a run and its per-test outcomes.
+
+    complete=False marks runs whose outcomes only list some tests (legacy
+    imports); they are kept for trends but excluded from flake statistics.
+    """
+    coverage = run["coverage"]
+    tests = run["tests"]
+    cursor = conn.execute(
+        "INSERT INTO runs (timestamp, percent_covered, covered_lines, missing_lines,"
+        " num_statements, total, passed, failed, error, skipped, complete)"
+        " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            run["timestamp"],
+            coverage["percent_covered"],
+            coverage["covered_lines"],
+            coverage["missing_lines"],
+            coverage["num_statements"],
+            tests["total"],
+            tests["passed"],
+            tests["failed"],
+            tests["error"],
+            tests["skipped"],
+            int(complete),
+        ),
+    )
+    conn.executemany(
+        "INSERT INTO results (nodeid, run_id, outcome) VALUES (?, ?, ?)",
+        [(nodeid, cursor.lastrowid, outcome) for nodeid, outcome in outcomes.items()],
+    )
+
+
+def load_recent_runs(conn: sqlite3.Connection, limit: int) -> list[dict]:
+    """Return the most recent runs, newest first, in report format.
+
+    Only the newest run carries its failed_tests list, which is all the
+    failure comparison needs.
+    """
+    rows = conn.execute(
+        "SELECT * FROM runs ORDER BY id DESC LIMIT ?", (limit,)
+    ).fetchall()
+    runs = []
+    for row in rows:
+        runs.append(
+            {
+                "timestamp": row["timestamp"],
+                "coverage": {
+                    "percent_covered": row["percent_covered"],
+                    "covered_lines": row["covered_lines"],
+                    "missing_lines": row["missing_lines"],
+                    "num_statements": row["num_statements"],
+                },
+                "tests": {
+                    "total": row["total"],
+                    "passed": row["passed"],
+                    "failed": row["failed"],
+                    "error": row["error"],
+                    "skipped": row["skipped"],
+                },
+            }
+        )
+    if rows:
+        failed = conn.execute(
+            "SELECT nodeid FROM results WHERE run_id = ? AND outcome IN (?, ?)",
+            (rows[0]["id"], *FAILING_OUTCOMES),
+        ).fetchall()
+        runs[0]["tests"]["failed_tests"] = [r["nodeid"] for r in failed]
+    return runs
+
+
+def test_history(conn: sqlite3.Connection, nodeid: str) -> dict | None:
+    """Summarize one test's outcome history.
+
+    The flake rate is the share of consecutive recorded runs in which the test
+    flipped between passing and failing. Skipped outcomes and imported legacy
+    runs (which only recorded failures) are ignored.
+    """
+    rows = conn.execute(
+        "SELECT runs.timestamp, results.outcome FROM results"
+        " JOIN runs ON runs.id = results.run_id"
+        " WHERE results.nodeid = ? AND results.outcome != 'skipped'"
+        " AND runs.complete = 1"
+        " ORDER BY results.run_id",
+        (nodeid,),
+    ).fetchall()
+    if not rows:
+        return None
+
+    failing = [row["outcome"] in FAILING_OUTCOMES for row in rows]
+    flips = sum(1 for a, b in zip(failing, failing[1:]) if a != b)
+    first_failed_at = next(
+        (row["timestamp"] for row, f in zip(rows, failing) if f), None
+    )
+    failing_since = None
+    for row, f in zip(reversed(rows), reversed(failing)):
+        if not f:
+            break
+        failing_since = row["timestamp"]
+
+    return {
+        "runs": len(rows),
+        "failures": sum(failing),
+        "flips": flips,
+        "flake_rate": flips / (len(rows) - 1) if len(rows) > 1 else 0.0,
+        "first_seen_at": rows[0]["timestamp"],
+        "first_failed_at": first_failed_at,
+        "failing_since": failing_since,
+        "last_outcome": rows[-1]["outcome"],
     }
 
 
+def flaky_tests(conn: sqlite3.Connection, limit: int) -> list[dict]:
+    rows = conn.execute(
+        """
+        SELECT nodeid, COUNT(*) AS runs, SUM(flip) AS flips,
+               SUM(failing) AS failures
+        FROM (
+            SELECT nodeid, failing,
+                   failing != LAG(failing, 1, failing)
+                       OVER (PARTITION BY nodeid ORDER BY run_id) AS flip
+            FROM (
+                SELECT nodeid, run_id, outcome IN (?, ?) AS failing
+                FROM results JOIN runs ON runs.id = results.run_id
+                WHERE outcome != 'skipped' AND runs.complete = 1
+            )
+        )
+        GROUP BY nodeid
+        HAVING flips > 0
+        ORDER BY CAST(flips AS REAL) / (runs - 1) DESC, flips DESC, nodeid
+        LIMIT ?
+        """,
+        (*FAILING_OUTCOMES, limit),
+    ).fetchall()
+    return [
+        {
+            "nodeid": row["nodeid"],
+            "runs": row["runs"],
+            "flips": row["flips"],
+            "failures": row["failures"],
+            "flake_rate": row["flips"] / (row["runs"] - 1),
+        }
+        for row in rows
+    ]
+
+
 def format_delta(
     current: float | int, previous: float | int | None, is_percent: bool = False
 ) -> str:
@@ -123,7 +453,7 @@ def build_trend(history: list[dict]) -> list[str]:
     if len(history) < 2:
         return []
     # History is newest-first; reverse for chronological display
-    recent = list(reversed(history[:5]))
+    recent = list(reversed(history[:TREND_RUNS]))
     trend_values = [f"{run['coverage']['percent_covered']}%" for run in recent]
     lines = []
     lines.append(f"### Coverage Trend (last {len(recent)} runs)")
@@ -145,7 +475,122 @@ def build_test_summary(tests: dict) -> list[str]:
     return lines
 
 
-def build_failure_sections(tests: dict, previous: dict | None) -> list[str]:
+def fingerprint(detail: dict) -> str:
+    """Identify failures that share a root cause.
+
+    Uses the crash signature of the traceback (the last `path:line: Error`
+    location and the `E` lines), with memory addresses masked, so that 500
+    tests broken by the same fixture collapse into one group. Falls back to
+    the whole normalized traceback when no signature is found.
+    """
+    traceback = ADDRESS_RE.sub("0x?", detail.get("traceback", ""))
+    tb_lines = traceback.splitlines()
+    locations = [line for line in tb_lines if LOCATION_RE.match(line)]
+    errors = [line for line in tb_lines if line.startswith("E ")]
+    signature = "\n".join(locations[-1:] + errors) or traceback
+    return hashlib.sha1(signature.encode("utf-8")).hexdigest()
+
+
+def group_failures(nodeids: set[str], details: dict) -> list[list[str]]:
+    """Group failing nodeids by fingerprint, largest groups first."""
+    groups: dict[str, list[str]] = {}
+    for nodeid in sorted(nodeids):
+        key = fingerprint(details[nodeid]) if nodeid in details else nodeid
+        groups.setdefault(key, []).append(nodeid)
+    return sorted(groups.values(), key=lambda g: (-len(g), g[0]))
+
+
+def clip(text: str, limit: int) -> str:
+    """Keep the tail of text (where the error is) within limit bytes."""
+    data = text.encode("utf-8")
+    if not limit or len(data) <= limit:
+        return text
+    tail = data[-limit:].decode("utf-8", errors="ignore")
+    return f"[… {len(data) - limit} bytes truncated]\n{tail}"
+
+
+def render_failure_group(
+    group: list[str],
+    details: dict,
+    max_block: int,
+    max_listed: int | None = None,
+    with_output: bool = True,
+) -> list[str]:
+    lines = []
+    if len(group) == 1:
+        lines.append(f"#### {group[0]}")
+    else:
+        listed = group if max_listed is None else group[:max_listed]
+        lines.append(f"#### {group[0]} (+{len(group) - 1} with the same failure)")
+        lines.append("Affected tests:")
+        lines.extend(f"- {nodeid}" for nodeid in listed)
+        if len(listed) < len(group):
+            lines.append(f"- … and {len(group) - len(listed)} more")
+        if with_output:
+            lines.append("")
+            lines.append(f"Representative output from `{group[0]}`:")
+    d = details.get(group[0], {}) if with_output else {}
+    if "traceback" in d:
+        lines.append("```")
+        lines.append(clip(d["traceback"], max_block))
+        lines.append("```")
+    for stream in ("stdout", "stderr"):
+        if stream in d:
+            lines.append(f"**{stream}:**")
+            lines.append("```")
+            lines.append(clip(d[stream], max_block))
+            lines.append("```")
+    lines.append("")
+    return lines
+
+
+def build_failure_list(
+    title: str, nodeids: set[str], details: dict, budget: dict
+) -> list[str]:
+    """Render one failure section, spending from the shared output budget.
+
+    A group that does not fit is retried with a shortened list of affected
+    tests, then without its output; once even that exceeds the budget, the
+    remaining failures are counted and omitted.
+    """
+    lines = [f"### {title}"]
+    groups = group_failures(nodeids, details)
+    for i, group in enumerate(groups):
+        for attempt in (
+            {},
+            {"max_listed": MAX_LISTED_TESTS},
+            {"max_listed": MAX_LISTED_TESTS, "with_output": False},
+        ):
+            block = render_failure_group(group, details, budget["max_block"], **attempt)
+            size = len("\n".join(block).encode("utf-8"))
+            if budget["remaining"] is None or size <= budget["remaining"]:
+                break
+        else:
+            omitted = sum(len(g) for g in groups[i:])
+            lines.append(
+                f"*… {omitted} more failures omitted (output budget reached).*"
+            )
+            lines.append("")
+            budget["remaining"] = 0
+            return lines
+        if budget["remaining"] is not None:
+            budget["remaining"] -= size
+        lines.extend(block)
+    return lines
+
+
+def build_failure_sections(
+    tests: dict,
+    previous: dict | None,
+    max_output: int = 0,
+    max_block: int = 0,
+) -> list[str]:
+    """Render new, fixed and pre-existing failures.
+
+    max_output caps the total bytes of failure output (new failures are
+    rendered first, so they get priority); max_block caps each traceback,
+    stdout or stderr block. 0 means unlimited.
+    """
     lines = []
     current_failures = set(tests["failed_tests"])
     prev_failures = (
@@ -154,32 +599,14 @@ def build_failure_sections(tests: dict, previous: dict | None) -> list[str]:
         else set()
     )
     details = tests.get("failure_details", {})
+    budget = {"remaining": max_output or None, "max_block": max_block}
 
     new_failures = current_failures - prev_failures
     fixed_tests = prev_failures - current_failures
     preexisting = current_failures & prev_failures
 
     if new_failures:
-        lines.append("### New Failures")
-        for nodeid in sorted(new_failures):
-            lines.append(f"#### {nodeid}")
-            if nodeid in details:
-                d = details[nodeid]
-                if "traceback" in d:
-                    lines.append("```")
-                    lines.append(d["traceback"])
-                    lines.append("```")
-                if "stdout" in d:
-                    lines.append("**stdout:**")
-                    lines.append("```")
-                    lines.append(d["stdout"])
-                    lines.append("```")
-                if "stderr" in d:
-                    lines.append("**stderr:**")
-                    lines.append("```")
-                    lines.append(d["stderr"])
-                    lines.append("```")
-            lines.append("")
+        lines.extend(build_failure_list("New Failures", new_failures, details, budget))
 
     if fixed_tests:
         lines.append("### Fixed Tests")
@@ -188,26 +615,9 @@ def build_failure_sections(tests: dict, previous: dict | None) -> list[str]:
         lines.append("")
 
     if preexisting:
-        lines.append("### Pre-existing Failures")
-        for nodeid in sorted(preexisting):
-            lines.append(f"#### {nodeid}")
-            if nodeid in details:
-                d = details[nodeid]
-                if "traceback" in d:
-                    lines.append("```")
-                    lines.append(d["traceback"])
-                    lines.append("```")
-                if "stdout" in d:
-                    lines.append("**stdout:**")
-                    lines.append("```")
-                    lines.append(d["stdout"])
-                    lines.append("```")
-                if "stderr" in d:
-                    lines.append("**stderr:**")
-                    lines.append("```")
-                    lines.append(d["stderr"])
-                    lines.append("```")
-            lines.append("")
+        lines.extend(
+            build_failure_list("Pre-existing Failures", preexisting, details, budget)
+        )
 
     return lines
 
@@ -230,14 +640,114 @@ def check_gitignore() -> list[str]:
     return lines
 
 
+def build_test_history(nodeid: str, history: dict | None) -> list[str]:
+    lines = [f"## Test History: {nodeid}", ""]
+    if history is None:
+        lines.append("*No recorded runs for this test.*")
+        lines.append("")
+        return lines
+    lines.append("| Metric | Value |")
+    lines.append("|---|---|")
+    lines.append(f"| Recorded runs | {history['runs']} |")
+    lines.append(f"| Failures | {history['failures']} |")
+    lines.append(f"| Flake rate | {history['flake_rate']:.0%} |")
+    lines.append(f"| Last outcome | {history['last_outcome']} |")
+    lines.append(f"| First seen | {history['first_seen_at']} |")
+    lines.append(f"| First failed | {history['first_failed_at'] or '—'} |")
+    lines.append(f"| Failing since | {history['failing_since'] or '—'} |")
+    lines.append("")
+    return lines
+
+
+def build_flaky_report(flaky: list[dict]) -> list[str]:
+    lines = ["## Flaky Tests", ""]
+    if not flaky:
+        lines.append("*No test has flipped between passing and failing.*")
+        lines.append("")
+        return lines
+    lines.append("| Test | Flake rate | Flips | Failures | Runs |")
+    lines.append("|---|---|---|---|---|")
+    for t in flaky:
+        lines.append(
+            f"| {t['nodeid']} | {t['flake_rate']:.0%} | {t['flips']} "
+            f"| {t['failures']} | {t['runs']} |"
+        )
+    lines.append("")
+    return lines
+
+
+def query_history(args: argparse.Namespace) -> None:
+    if not os.path.exists(BASELINE_FILE):
+        print(f"Error: No baseline found at `{BASELINE_FILE}`.", file=sys.stderr)
+        sys.exit(1)
+    conn = open_baseline(BASELINE_FILE)
+    try:
+        if args.test:
+            lines = build_test_history(args.test, test_history(conn, args.test))
+        else:
+            lines = build_flaky_report(flaky_tests(conn, args.flaky))
+    finally:
+        conn.close()
+    print("\n".join(lines))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Compare pytest + coverage results against the baseline history."
+    )
+    query = parser.add_mutually_exclusive_group()
+    query.add_argument(
+        "--test", metavar="NODEID", help="Show the outcome history of one test"
+    )
+    query.add_argument(
+        "--flaky",
+        metavar="N",
+        type=int,
+        nargs="?",
+        const=20,
+        help="List the N tests with the highest flake rate (default: 20)",
+    )
+    parser.add_argument(
+        "--partial",
+        action="store_true",
+        help="The run only covers some tests: compare just those, skip the "
+        "coverage delta and do not record the run",
+    )
+    parser.add_argument(
+        "--max-output",
+        metavar="BYTES",
+        type=int,
+        default=MAX_FAILURE_OUTPUT,
+        help="Budget for all failure output; 0 disables the limit "
+        f"(default: {MAX_FAILURE_OUTPUT})",
+    )
+    parser.add_argument(
+        "--max-block",
+        metavar="BYTES",
+        type=int,
+        default=MAX_FAILURE_BLOCK,
+        help="Budget for each traceback, stdout or stderr block; 0 disables "
+        f"the limit (default: {MAX_FAILURE_BLOCK})",
+    )
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
+    if args.test or args.flaky is not None:
+        query_history(args)
+        return
+
     # Check for required input files
+    coverage_paths = find_inputs(COVERAGE_FILE, COVERAGE_SHARD_RE)
+    report_paths = find_inputs(PYTEST_REPORT_FILE, PYTEST_REPORT_SHARD_RE)
+
     missing = []
-    if not os.path.exists(COVERAGE_FILE):
+    if not coverage_paths:
         missing.append(
             f"`{COVERAGE_FILE}` — install pytest-cov: `pip install pytest-cov`"
         )
-    if not os.path.exists(PYTEST_REPORT_FILE):
+    if not report_paths:
         missing.append(
             f"`{PYTEST_REPORT_FILE}` — install pytest-json-report: `pip install pytest-json-report`"
         )
@@ -256,25 +766,37 @@ def main():
         sys.exit(1)
 
     # Load data
-    cov_data = load_json(COVERAGE_FILE)
-    test_data = load_json(PYTEST_REPORT_FILE)
+    cov_shards = [load_json(path) for path in coverage_paths]
+    report_shards = [load_json(path) for path in report_paths]
 
-    if cov_data is None or test_data is None:
+    if None in cov_shards or None in report_shards:
         print("Error: Failed to read test output files.", file=sys.stderr)
         sys.exit(1)
 
+    cov_data = merge_coverage(cov_shards)
+    test_data = merge_reports(report_shards)
+
     coverage = extract_coverage(cov_data)
     tests = extract_tests(test_data)
 
-    # Load history
-    baseline = load_json(BASELINE_FILE)
-    if baseline is None:
-        baseline = {"runs": []}
-
-    history = baseline.get("runs", [])
+    # Load recent history (the store itself is never fully read)
+    conn = open_baseline(BASELINE_FILE)
+    history = load_recent_runs(conn, TREND_RUNS - 1)
     previous = history[0] if history else None
-
-    # Build current run record (without failure_details — too large for history)
+    if args.partial and history:
+        # Coverage of a subset is not comparable, and tests that did not run
+        # are neither fixed nor still failing
+        prev_failures = history[0]["tests"]["failed_tests"]
+        previous = {
+            "tests": {
+                "failed_tests": [
+                    nodeid for nodeid in prev_failures if nodeid in tests["outcomes"]
+                ]
+            }
+        }
+        history = []
+
+    # Build current run record (per-test outcomes are stored separately)
     current_run = {
         "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
         "coverage": coverage,
@@ -284,7 +806,6 @@ def main():
             "failed": tests["failed"],
             "error": tests["error"],
             "skipped": tests["skipped"],
-            "failed_tests": tests["failed_tests"],
         },
     }
 
@@ -293,23 +814,26 @@ def main():
     report.extend(build_report(coverage, previous))
     report.extend(build_trend([current_run] + history))
     report.extend(build_test_summary(tests))
-    report.extend(build_failure_sections(tests, previous))
+    report.extend(
+        build_failure_sections(tests, previous, args.max_output, args.max_block)
+    )
     report.extend(check_gitignore())
 
-    if previous is None:
+    if args.partial:
+        report.append("*Partial run — compared to the baseline, not recorded.*")
+        report.append("")
+    elif previous is None:
         report.append("*First run — baseline established.*")
         report.append("")
 
-    # Update history (newest first, max 10)
-    history.insert(0, current_run)
-    baseline["runs"] = history[:MAX_HISTORY]
-
-    with open(BASELINE_FILE, "w", encoding="utf-8") as f:
-        json.dump(baseline, f, indent=2)
-        f.write("\n")
+    # Append the current run to the history
+    if not args.partial:
+        with conn:
+            append_run(conn, current_run, tests["outcomes"])
+    conn.close()
 
     # Cleanup temp files
-    for path in (COVERAGE_FILE, PYTEST_REPORT_FILE):
+    for path in coverage_paths + report_paths:
         try:
             os.remove(path)
         except OSError:
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""Rerun tests on file changes from a process with warm imports.
+
+The parent process runs a throwaway collection once, only to import pytest,
+its plugins and the third-party dependencies the tests pull in. Collected
+items are not reused: each run forks a worker that drops project-local
+modules from sys.modules (so edited code is re-imported), collects and runs
+pytest with the same coverage and JSON report options as /tests, and exits.
+The saving is the import time of dependencies, not collection.
+
+When only test files changed, just those files are rerun; any other change
+(including source files) reruns the full selection. compare_results.py then
+prints the usual report. Full runs are recorded in the baseline; runs
+restricted to changed test files are compared with --partial and not
+recorded.
+
+Usage:
+  watch_tests.py [--interval SECONDS] [--once] [-- pytest args...]
+"""
+
+import argparse
+import contextlib
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+COMPARE_SCRIPT = Path(__file__).with_name("compare_results.py")
+PYTEST_OPTIONS = [
+    "--cov",
+    "--cov-report=json",
+    "--json-report",
+    "--json-report-file=.pytest-report.json",
+]
+IGNORED_DIRS = {
+    ".git",
+    ".venv",
+    "venv",
+    ".tox",
+    ".nox",
+    "node_modules",
+    "__pycache__",
+    "site-packages",
+    ".pytest_cache",
+    ".mypy_cache",
+    ".ruff_cache",
+}
+# pytest options whose separate value may be an existing path or a name,
+# not a test selection
+VALUE_OPTIONS = {
+    "-c",
+    "--config-file",
+    "--rootdir",
+    "--confcutdir",
+    "--basetemp",
+    "--ignore",
+    "--ignore-glob",
+    "--deselect",
+    "--junitxml",
+    "--junit-xml",
+    "-p",
+    "-k",
+    "-m",
+    "-o",
+    "--override-ini",
+}
+
+
+def is_project_file(path: Path, root: Path) -> bool:
+    try:
+        relative = path.relative_to(root)
+    except ValueError:
+        return False
+    return not IGNORED_DIRS.intersection(relative.parts)
+
+
+def is_test_file(path: Path) -> bool:
+    return path.name.startswith("test_") or path.name.endswith("_test.py")
+
+
+def snapshot(root: Path) -> dict[Path, int]:
+    """Map every project .py file to its mtime."""
+    mtimes = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in IGNORED_DIRS]
+        for filename in filenames:
+            if filename.endswith(".py"):
+                path = Path(dirpath) / filename
+                with contextlib.suppress(OSError):
+                    mtimes[path] = path.stat().st_mtime_ns
+    return mtimes
+
+
+def changed_files(before: dict[Path, int], after: dict[Path, int]) -> set[Path]:
+    return {
+        path
+        for path in before.keys() | after.keys()
+        if before.get(path) != after.get(path)
+    }
+
+
+def warm_up(root: Path, pytest_args: list[str]) -> None:
+    """Collect once to import pytest, plugins and dependencies into sys.modules."""
+    import pytest  # pylint: disable=import-outside-toplevel
+
+    start = time.monotonic()
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        with contextlib.redirect_stdout(devnull):
+            pytest.main(["--collect-only", "-q", *pytest_args])
+    warm_modules = sum(
+        1
+        for mod in list(sys.modules.values())
+        if getattr(mod, "__file__", None)
+        and not is_project_file(Path(mod.__file__).resolve(), root)
+    )
+    print(
+        f"Warm: {warm_modules} modules pre-imported in {time.monotonic() - start:.1f}s",
+        file=sys.stderr,
+    )
+
+
+def purge_project_modules(root: Path) -> None:
+    """Forget project modules so the worker re-imports the current code."""
+    for name, mod in list(sys.modules.items()):
+        path = getattr(mod, "__file__", None)
+        if path and is_project_file(Path(path).resolve(), root):
+            del sys.modules[name]
+
+
+def run_worker(root: Path, pytest_args: list[str]) -> int:
+    """Fork a worker from the warm parent and run pytest in it."""
+    sys.stdout.flush()
+    sys.stderr.flush()
+    pid = os.fork()
+    if pid == 0:
+        code = 1
+        try:
+            import pytest  # pylint: disable=import-outside-toplevel
+
+            purge_project_modules(root)
+            code = int(pytest.main(PYTEST_OPTIONS + pytest_args))
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(code)  # pylint: disable=protected-access
+    _, status = os.waitpid(pid, 0)
+    return os.waitstatus_to_exitcode(status)
+
+
+def report(partial: bool) -> None:
+    result = subprocess.run(
+        [sys.executable, str(COMPARE_SCRIPT), *(["--partial"] if partial else [])],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    print(result.stdout, end="")
+    if result.returncode != 0:
+        print(result.stderr, end="", file=sys.stderr)
+
+
+def split_selection(root: Path, pytest_args: list[str]) -> tuple[list[str], list[str]]:
+    """Split pytest args into (test paths, other options)."""
+    paths, options = [], []
+    for i, arg in enumerate(pytest_args):
+        is_value = i > 0 and pytest_args[i - 1] in VALUE_OPTIONS
+        if (
+            not arg.startswith("-")
+            and not is_value
+            and (root / arg.split("::")[0]).exists()
+        ):
+            paths.append(arg)
+        else:
+            options.append(arg)
+    return paths, options
+
+
+def select_args(changed: set[Path], root: Path, pytest_args: list[str]) -> list[str]:
+    """Rerun only the changed test files when nothing else changed.
+
+    The user's options (-m, -k, -x...) are kept. Narrowing only happens when
+    every changed file is inside the user's path selection (whole files or
+    directories); otherwise the full selection reruns.
+    """
+    existing = [path for path in changed if path.exists()]
+    if not existing or not all(is_test_file(path) for path in existing):
+        return pytest_args
+    paths, options = split_selection(root, pytest_args)
+    if any("::" in path for path in paths):
+        return pytest_args
+    selected = [(root / path).resolve() for path in paths] or [root]
+    for path in existing:
+        resolved = path.resolve()
+        if not any(resolved == s or s in resolved.parents for s in selected):
+            return pytest_args
+    return options + sorted(str(path.relative_to(root)) for path in existing)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Rerun tests on file changes from a warm pytest process."
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.5,
+        help="Seconds between file change checks (default: 0.5)",
+    )
+    parser.add_argument(
+        "--once",
+        action="store_true",
+        help="Run once from the warm process and exit",
+    )
+    parser.add_argument(
+        "pytest_args", nargs=argparse.REMAINDER, help="Arguments passed to pytest"
+    )
+    args = parser.parse_args()
+    if args.pytest_args[:1] == ["--"]:
+        args.pytest_args = args.pytest_args[1:]
+    return args
+
+
+def main():
+    args = parse_args()
+    if not hasattr(os, "fork"):
+        print("Error: watch mode requires os.fork (Linux or macOS).", file=sys.stderr)
+        sys.exit(1)
+
+    root = Path.cwd().resolve()
+    warm_up(root, args.pytest_args)
+
+    mtimes = snapshot(root)
+    run_args = args.pytest_args
+    while True:
+        start = time.monotonic()
+        code = run_worker(root, run_args)
+        print(
+            f"pytest exited with {code} in {time.monotonic() - start:.1f}s",
+            file=sys.stderr,
+        )
+        report(partial=run_args is not args.pytest_args)
+        if args.once:
+            return
+
+        print("Watching for changes (Ctrl+C to stop)…", file=sys.stderr)
+        try:
+            while True:
+                time.sleep(args.interval)
+                current = snapshot(root)
+                changed = changed_files(mtimes, current)
+                if changed:
+                    mtimes = current
+                    break
+        except KeyboardInterrupt:
+            return
+        run_args = select_args(changed, root, args.pytest_args)
+
+
+if __name__ == "__main__":
+    main()
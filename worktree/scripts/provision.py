@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""Provision a worktree with dependency directories from the main worktree.
+
+Instead of reinstalling virtualenvs and node_modules in every new worktree,
+shares the git-ignored dependency and cache directories of the main worktree:
+  - reflink (copy-on-write clone) where the filesystem supports it: cp
+    --reflink on Linux (btrfs, XFS), clonefile on macOS (APFS). Both
+    worktrees can then change their copy freely.
+  - hardlinks otherwise, for package directories only (virtualenvs,
+    node_modules): file contents are shared, not copied. pip, uv and npm
+    replace files rather than editing them in place, so installs in one
+    worktree do not leak into the other. Tool and build caches (pytest, mypy,
+    ruff, cargo target, .next/cache, .turbo, node_modules/.cache) are
+    rewritten in place, so they are never hardlinked: without reflinks they
+    are copied.
+  - a plain copy across filesystems, where links are impossible
+
+Files that embed the main worktree's absolute path (virtualenv scripts and
+activate files, .pth files, editable-install finders, direct_url.json) are
+rewritten as new files pointing at the target worktree, and absolute symlinks
+into the main worktree are retargeted.
+
+Usage:
+  provision.py <worktree> [--source DIR] [--mode auto|reflink|hardlink|copy]
+               [--dir NAME ...] [--dry-run]
+"""
+
+import argparse
+import fnmatch
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Package directories: files are only ever replaced, so hardlinks are safe
+PACKAGE_DIRS = [".venv", "venv", "node_modules"]
+# Caches inside package directories, rewritten in place: copied, not hardlinked
+PACKAGE_CACHE_DIRS = {"node_modules": (".cache",)}
+# Tool and build caches, rewritten in place: reflinked or copied
+CACHE_DIRS = [
+    ".tox",
+    ".nox",
+    ".mypy_cache",
+    ".ruff_cache",
+    ".pytest_cache",
+    "target",
+    ".next/cache",
+    ".turbo",
+]
+DEFAULT_DIRS = PACKAGE_DIRS + CACHE_DIRS
+# Files that may embed the source worktree's absolute path
+REWRITE_PATTERNS = [
+    "*.pth",
+    "*.egg-link",
+    "__editable__*",
+    "direct_url.json",
+    "pyvenv.cfg",
+    "activate*",
+]
+# Every file in these directories is checked (entry-point scripts, shebangs)
+REWRITE_DIRS = {"bin", "Scripts"}
+MAX_REWRITE_SIZE = 1024 * 1024
+
+
+def main_worktree() -> Path:
+    result = subprocess.run(
+        ["git", "worktree", "list", "--porcelain"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    first = result.stdout.splitlines()[0]
+    return Path(first.removeprefix("worktree "))
+
+
+def is_ignored(root: Path, name: str) -> bool:
+    result = subprocess.run(
+        ["git", "-C", str(root), "check-ignore", "-q", name], check=False
+    )
+    return result.returncode == 0
+
+
+def fmt_size(size: float) -> str:
+    if size >= 1024 * 1024 * 1024:
+        return f"{size / 1024 / 1024 / 1024:.1f} GiB"
+    if size >= 1024 * 1024:
+        return f"{size / 1024 / 1024:.1f} MiB"
+    return f"{size / 1024:.1f} KiB"
+
+
+def tree_size(path: Path) -> tuple[int, int]:
+    files = size = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            full = os.path.join(dirpath, name)
+            if not os.path.islink(full):
+                files += 1
+                size += os.path.getsize(full)
+    return files, size
+
+
+def reflink_command() -> list[str]:
+    if sys.platform == "darwin":
+        return ["cp", "-c", "-pR"]
+    return ["cp", "-a", "--reflink=always"]
+
+
+def reflink_supported(source: Path, target_parent: Path) -> bool:
+    """Probe with one file: reflinks need support from the filesystem."""
+    sample = next(
+        (
+            Path(dirpath) / name
+            for dirpath, _, filenames in os.walk(source)
+            for name in filenames
+            if not os.path.islink(os.path.join(dirpath, name))
+        ),
+        None,
+    )
+    if sample is None:
+        return False
+    with tempfile.TemporaryDirectory(dir=target_parent) as tmp:
+        result = subprocess.run(
+            [*reflink_command(), str(sample), os.path.join(tmp, "probe")],
+            capture_output=True,
+            check=False,
+        )
+    return result.returncode == 0
+
+
+def reflink_tree(source: Path, target: Path) -> bool:
+    result = subprocess.run(
+        [*reflink_command(), str(source), str(target)],
+        capture_output=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        shutil.rmtree(target, ignore_errors=True)
+    return result.returncode == 0
+
+
+def link_tree(
+    source: Path, target: Path, hardlink: bool, copy_dirs: tuple[str, ...] = ()
+) -> str:
+    """Recreate source at target with hardlinks (or copies); return the method.
+
+    Files under copy_dirs (relative to source) are always copied. Falls back
+    to copying for the rest of the tree if hardlinks fail, e.g. across
+    filesystems.
+    """
+    method = "hardlink" if hardlink else "copy"
+    for dirpath, dirnames, filenames in os.walk(source):
+        rel = os.path.relpath(dirpath, source)
+        out_dir = target / rel if rel != "." else target
+        out_dir.mkdir(exist_ok=True)
+        shutil.copystat(dirpath, out_dir)
+        copy_here = any(
+            rel == path or rel.startswith(path + os.sep) for path in copy_dirs
+        )
+        for name in dirnames + filenames:
+            src = os.path.join(dirpath, name)
+            dst = out_dir / name
+            if os.path.islink(src):
+                os.symlink(os.readlink(src), dst)
+            elif name in filenames:
+                if method == "hardlink" and not copy_here:
+                    try:
+                        os.link(src, dst)
+                        continue
+                    except OSError:
+                        method = "copy"
+                shutil.copy2(src, dst)
+        # os.walk does not descend into symlinked directories, recreated above
+    return method
+
+
+def rewrite_paths(target: Path, source_root: Path, target_root: Path) -> dict:
+    """Point files and symlinks that embed the source worktree at the target.
+
+    Rewritten files are written as new files, so a hardlinked original in the
+    source worktree is left untouched. linked_size counts the bytes of files
+    still hardlinked to the source after rewriting.
+    """
+    # Whole path components only: /repo must not match /repo-other
+    old = re.compile(re.escape(str(source_root).encode()) + rb"(?![\w.-])")
+    new = str(target_root).encode()
+    stats = {
+        "files": 0,
+        "size": 0,
+        "linked_size": 0,
+        "rewritten": 0,
+        "rewritten_size": 0,
+    }
+    for dirpath, dirnames, filenames in os.walk(target):
+        in_rewrite_dir = os.path.basename(dirpath) in REWRITE_DIRS
+        for name in dirnames + filenames:
+            path = os.path.join(dirpath, name)
+            if os.path.islink(path):
+                link = os.readlink(path)
+                if link == str(source_root) or link.startswith(
+                    str(source_root) + os.sep
+                ):
+                    os.unlink(path)
+                    os.symlink(str(target_root) + link[len(str(source_root)) :], path)
+                continue
+            if name not in filenames:
+                continue
+
+            size = os.path.getsize(path)
+            stats["files"] += 1
+            stats["size"] += size
+            source_file = source_root / os.path.relpath(path, target_root)
+            try:
+                linked = os.path.samefile(path, source_file)
+            except OSError:
+                linked = False
+            if linked:
+                stats["linked_size"] += size
+            candidate = in_rewrite_dir or any(
+                fnmatch.fnmatch(name, pattern) for pattern in REWRITE_PATTERNS
+            )
+            if not candidate or size > MAX_REWRITE_SIZE:
+                continue
+            with open(path, "rb") as f:
+                data = f.read()
+            if b"\0" in data[:8192] or not old.search(data):
+                continue
+
+            fd, tmp_path = tempfile.mkstemp(dir=dirpath, prefix=f".{name}.")
+            with os.fdopen(fd, "wb") as f:
+                f.write(old.sub(lambda _: new, data))
+            shutil.copymode(path, tmp_path)
+            os.replace(tmp_path, path)
+            stats["rewritten"] += 1
+            stats["rewritten_size"] += size
+            if linked:
+                stats["linked_size"] -= size
+    return stats
+
+
+def provision(name: str, source_root: Path, target_root: Path, mode: str) -> dict:
+    source = source_root / name
+    target = target_root / name
+    target.parent.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+
+    method = None
+    if mode in ("auto", "reflink") and reflink_supported(source, target.parent):
+        if reflink_tree(source, target):
+            method = "reflink"
+    if method is None:
+        if mode == "reflink":
+            raise OSError(f"reflinks are not supported for {source}")
+        # Only package directories may share inodes with the source worktree
+        method = link_tree(
+            source,
+            target,
+            hardlink=mode != "copy" and name in PACKAGE_DIRS,
+            copy_dirs=PACKAGE_CACHE_DIRS.get(name, ()),
+        )
+
+    stats = rewrite_paths(target, source_root, target_root)
+    if method == "reflink":
+        shared = stats["size"] - stats["rewritten_size"]
+    else:
+        # Copied caches and files linked before a hardlink failure are exact
+        shared = stats["linked_size"]
+    return {
+        "dir": name,
+        "method": method,
+        "files": stats["files"],
+        "size": stats["size"],
+        "shared": shared,
+        "rewritten": stats["rewritten"],
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Share dependency directories of the main worktree with "
+        "another worktree (reflink or hardlink)."
+    )
+    parser.add_argument("worktree", type=Path, help="Worktree to provision")
+    parser.add_argument(
+        "--source",
+        type=Path,
+        help="Worktree to provision from (default: the main worktree)",
+    )
+    parser.add_argument(
+        "--mode",
+        choices=["auto", "reflink", "hardlink", "copy"],
+        default="auto",
+        help="auto: reflink if supported, else hardlink package directories and "
+        "copy caches (default: auto)",
+    )
+    parser.add_argument(
+        "--dir",
+        action="append",
+        dest="dirs",
+        metavar="NAME",
+        help=f"Directory to provision, repeatable (default: {' '.join(DEFAULT_DIRS)})",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Show what would be provisioned"
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    source_root = (args.source or main_worktree()).resolve()
+    target_root = args.worktree.resolve()
+    if source_root == target_root:
+        print("Error: source and target worktree are the same.", file=sys.stderr)
+        sys.exit(1)
+    if not target_root.is_dir():
+        print(f"Error: worktree not found: {target_root}", file=sys.stderr)
+        sys.exit(1)
+
+    lines = [f"## Worktree Provisioning: {target_root}", ""]
+    lines.append(f"Source: {source_root}")
+    lines.append("")
+    selected = []
+    for name in args.dirs or DEFAULT_DIRS:
+        source = source_root / name
+        if not source.is_dir() or source.is_symlink():
+            continue
+        if (target_root / name).exists():
+            lines.append(f"- `{name}`: already exists in the worktree, skipped")
+        elif not is_ignored(source_root, name):
+            lines.append(f"- `{name}`: not git-ignored, skipped")
+        else:
+            selected.append(name)
+    if len(lines) > 4:
+        lines.append("")
+
+    if not selected:
+        lines.append("*Nothing to provision.*")
+        print("\n".join(lines))
+        return
+
+    if args.dry_run:
+        lines.append("| Directory | Files | Size |")
+        lines.append("|---|---|---|")
+        for name in selected:
+            files, size = tree_size(source_root / name)
+            lines.append(f"| `{name}` | {files} | {fmt_size(size)} |")
+        print("\n".join(lines))
+        return
+
+    start = time.perf_counter()
+    try:
+        results = [
+            provision(name, source_root, target_root, args.mode) for name in selected
+        ]
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+
+    lines.append("| Directory | Method | Files | Size | Rewritten | Time |")
+    lines.append("|---|---|---|---|---|---|")
+    for r in results:
+        lines.append(
+            f"| `{r['dir']}` | {r['method']} | {r['files']} | {fmt_size(r['size'])} "
+            f"| {r['rewritten']} | {r['seconds']:.2f}s |"
+        )
+    lines.append("")
+    shared = sum(r["shared"] for r in results)
+    total = sum(r["size"] for r in results)
+    lines.append(
+        f"Provisioned {len(results)} "
+        f"{'directory' if len(results) == 1 else 'directories'} ({fmt_size(total)}) in "
+        f"{elapsed:.1f}s, without reinstalling. Disk saved: {fmt_size(shared)} "
+        "shared with the source worktree."
+    )
+    print("\n".join(lines))
+
+
+if __name__ == "__main__":
+    main()